@@ -0,0 +1 @@
+# Benchmarks for the mini neural network framework
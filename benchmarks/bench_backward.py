@@ -0,0 +1,59 @@
+"""
+Benchmark Value.backward time against graph depth
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+
+def build_chain(depth):
+    """Build a chain `depth` nodes deep, like an epoch of summed losses"""
+    x = Value(0.5)
+    total = Value(0.0)
+    for _ in range(depth):
+        total = total + x * x
+    return x, total
+
+def recursive_backward(root):
+    """The recursive backward() used before, kept for comparison"""
+    topo = []
+    visited = set()
+    def build_topo(v):
+        if v not in visited:
+            visited.add(v)
+            for child in v._prev:
+                build_topo(child)
+            topo.append(v)
+    build_topo(root)
+
+    root.grad = 1.0
+    for node in reversed(topo):
+        node._backward()
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(depths=(100, 1000, 10000, 100000)):
+    print(f"{'depth':>8} {'recursive (ms)':>16} {'iterative (ms)':>16} {'cached topo (ms)':>18}")
+    for depth in depths:
+        x, total = build_chain(depth)
+
+        try:
+            t_rec = f"{best_of(lambda: recursive_backward(total)) * 1e3:16.2f}"
+        except RecursionError:
+            t_rec = f"{'RecursionError':>16}"
+
+        t_iter = best_of(lambda: total.backward(retain_graph=True))
+        topo = total.topo_order()
+        t_cached = best_of(lambda: total.backward(topo=topo, retain_graph=True))
+        print(f"{depth:>8} {t_rec} {t_iter * 1e3:16.2f} {t_cached * 1e3:18.2f}")
+
+if __name__ == "__main__":
+    main()
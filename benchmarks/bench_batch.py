@@ -0,0 +1,51 @@
+"""
+Benchmark per-sample versus batched MLP training throughput
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+
+def per_sample_step(model, X, y):
+    total = Value(0.0)
+    for xi, yi in zip(X.tolist(), y.tolist()):
+        pred = model([Value(v) for v in xi])
+        total = total + (pred - yi) ** 2
+    model.zero_grad()
+    total.backward()
+
+def batched_step(model, X, y):
+    pred = model.forward_batch(X)
+    loss = ((pred - y[:, None]) ** 2).sum()
+    model.zero_grad()
+    loss.backward()
+
+def samples_per_second(step, model, X, y, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        step(model, X, y)
+        best = min(best, time.perf_counter() - start)
+    return len(X) / best
+
+def main(batch_sizes=(1, 8, 64, 256, 1024)):
+    model = MLP(16, [32, 32, 1])
+    # Per-sample steps work either way; batched ones need the buffer to
+    # read weights as array views instead of gathering them every step
+    model.flatten_parameters()
+    rng = np.random.default_rng(0)
+    print("MLP(16, [32, 32, 1]) forward + backward, samples per second")
+    print(f"{'batch':>6} {'per-sample':>12} {'batched':>12} {'speedup':>8}")
+    for n in batch_sizes:
+        X = rng.normal(size=(n, 16))
+        y = rng.normal(size=n)
+        eager = samples_per_second(per_sample_step, model, X, y)
+        batched = samples_per_second(batched_step, model, X, y)
+        print(f"{n:>6} {eager:12.0f} {batched:12.0f} {batched / eager:7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark gradient checkpointing: peak memory against recompute time
+"""
+import sys
+import os
+import gc
+import time
+import random
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from mymicrograd.checkpoint import checkpoint_sequential
+
+def forward(model, x, segments):
+    xs = [Value(v) for v in x]
+    out = checkpoint_sequential(model.layers, xs, segments) if segments else model(xs)
+    return out ** 2
+
+def step(model, x, segments):
+    model.zero_grad()
+    forward(model, x, segments).backward()
+
+def main(width=32, depth=16):
+    random.seed(0)
+    model = MLP(width, [width] * depth + [1])
+    x = [random.uniform(-1, 1) for _ in range(width)]
+    step(model, x, 0)  # parameter grads become floats before memory is traced
+    print(f"MLP({width}, [{width}] * {depth} + [1]), one sample forward+backward")
+    print(f"{'segments':>9} {'graph MB':>9} {'peak MB':>8} {'ms':>8} {'time':>6}")
+    baseline = None
+    for segments in (0, 1, 2, 4, 8, depth + 1):
+        gc.collect()
+        tracemalloc.start()
+        loss = forward(model, x, segments)
+        graph = tracemalloc.get_traced_memory()[0]
+        model.zero_grad()
+        loss.backward()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del loss
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            step(model, x, segments)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        label = segments or 'none'
+        print(f"{label:>9} {graph / 1e6:9.3f} {peak / 1e6:8.3f} {best * 1e3:8.2f} {best / baseline:5.2f}x")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,69 @@
+"""
+Benchmark eager training steps against the trace-and-replay compiler
+and the code it generates
+"""
+import sys
+import os
+import time
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mymicrograd
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from losses import MSELoss
+
+def eager_epoch(model, loss_fn, dataset):
+    model.zero_grad()
+    for x, y in dataset:
+        loss = loss_fn(model([Value(xi) for xi in x]), y)
+        loss.backward()
+
+def compiled_epoch(compiled, dataset):
+    compiled.model.zero_grad()
+    for x, y in dataset:
+        compiled(x, y)
+
+def numpy_epoch(compiled, X, Y):
+    compiled.model.zero_grad()
+    compiled(X, Y)
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(name, model, dataset):
+    import numpy as np
+    mse = MSELoss()
+    loss_fn = lambda pred, y: mse([pred], [y])
+    tape = mymicrograd.compile(model, loss_fn)
+    python = mymicrograd.compile(model, loss_fn, backend='python')
+    vectorized = mymicrograd.compile(model, loss_fn, backend='numpy')
+    X = np.array([x for x, _ in dataset])
+    Y = np.array([y for _, y in dataset])
+    # Trace and generate outside the timed region
+    tape(*dataset[0])
+    python(*dataset[0])
+    vectorized(X, Y)
+
+    t_eager = best_of(lambda: eager_epoch(model, loss_fn, dataset))
+    t_tape = best_of(lambda: compiled_epoch(tape, dataset))
+    t_python = best_of(lambda: compiled_epoch(python, dataset))
+    t_numpy = best_of(lambda: numpy_epoch(vectorized, X, Y))
+    print(f"{name:>28} {t_eager * 1e3:10.2f} " + " ".join(
+        f"{t * 1e3:9.2f} ({t_eager / t:5.1f}x)" for t in (t_tape, t_python, t_numpy)))
+
+def main():
+    random.seed(0)
+    print(f"{'model (epoch), ms':>28} {'eager':>10} {'tape':>18} {'python codegen':>18} {'numpy codegen':>18}")
+    xor = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+    run("XOR MLP(2, [4, 1]) x4", MLP(2, [4, 1]), xor)
+    data = [([random.uniform(-1, 1) for _ in range(16)], random.uniform(-1, 1)) for _ in range(32)]
+    run("MLP(16, [64, 64, 1]) x32", MLP(16, [64, 64, 1]), data)
+
+if __name__ == "__main__":
+    main()
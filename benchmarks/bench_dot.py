@@ -0,0 +1,55 @@
+"""
+Benchmark the fused Value.dot neuron against the unfused weighted sum
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import Layer
+
+def unfused_layer(layer, x):
+    """The Neuron.__call__ used before Value.dot, kept for comparison"""
+    outs = []
+    for n in layer.neurons:
+        act = sum(wi*xi for wi, xi in zip(n.w, x)) + n.b
+        outs.append(act.tanh())
+    return outs
+
+def fused_layer(layer, x):
+    return layer(x)
+
+def graph_stats(outs):
+    """Count interior nodes and the longest path from an output to a leaf"""
+    root = sum(outs)
+    topo = root.topo_order()
+    depth = {}
+    for node in topo:
+        depth[node] = 1 + max((depth[c] for c in node._prev), default=-1)
+    interior = sum(1 for node in topo if node._prev)
+    return interior, max(depth[o] for o in outs)
+
+def step_time(forward, layer, x, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outs = forward(layer, x)
+        sum(outs).backward()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(widths=(16, 128, 512)):
+    print(f"{'layer':>12} {'nodes before':>13} {'nodes after':>12} {'depth before':>13} {'depth after':>12} {'ms before':>10} {'ms after':>9}")
+    for nin in widths:
+        layer = Layer(nin, nin)
+        x = [Value(0.001 * i) for i in range(nin)]
+        nodes_before, depth_before = graph_stats(unfused_layer(layer, x))
+        nodes_after, depth_after = graph_stats(fused_layer(layer, x))
+        t_before = step_time(unfused_layer, layer, x)
+        t_after = step_time(fused_layer, layer, x)
+        print(f"{f'{nin}x{nin}':>12} {nodes_before:13} {nodes_after:12} {depth_before:13} {depth_after:12} "
+              f"{t_before * 1e3:10.1f} {t_after * 1e3:9.1f}")
+
+if __name__ == "__main__":
+    main()
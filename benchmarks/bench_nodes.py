@@ -0,0 +1,57 @@
+"""
+Benchmark memory per Value node and node construction throughput
+"""
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+
+def count_nodes(root):
+    return len(root.topo_order())
+
+def bytes_per_node(model, x):
+    """Measure the memory held by one forward graph, per node"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    out = model(x)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    nodes = count_nodes(out) - len(model.parameters()) - len(x)
+    return (after - before) / nodes, nodes
+
+def nodes_per_second(model, x, repeat=3):
+    """Measure how fast forward graphs are built, in nodes per second"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = model(x)
+        best = min(best, time.perf_counter() - start)
+    nodes = count_nodes(out) - len(model.parameters()) - len(x)
+    return nodes / best
+
+def backward_nodes_per_second(model, x, repeat=3):
+    """Measure how fast a built graph is back-propagated, in nodes per second"""
+    best = float('inf')
+    for _ in range(repeat):
+        out = model(x)
+        topo = out.topo_order()
+        start = time.perf_counter()
+        out.backward(topo=topo, retain_graph=True)
+        best = min(best, time.perf_counter() - start)
+    return len(topo) / best
+
+def main():
+    model = MLP(64, [128, 128, 1])
+    x = [Value(0.01 * i) for i in range(64)]
+    per_node, nodes = bytes_per_node(model, x)
+    print(f"MLP(64, [128, 128, 1]) forward graph: {nodes} nodes")
+    print(f"bytes per node:            {per_node:12.1f}")
+    print(f"forward nodes per second:  {nodes_per_second(model, x):12.0f}")
+    print(f"backward nodes per second: {backward_nodes_per_second(model, x):12.0f}")
+
+if __name__ == "__main__":
+    main()
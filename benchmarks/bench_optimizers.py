@@ -0,0 +1,34 @@
+"""
+Benchmark optimizer steps per parameter against flat-buffer steps
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.neuralnet import MLP
+from optimizers import SGD, SGDMomentum, Adam
+
+def step_time(optimizer, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        optimizer.zero_grad()
+        optimizer.step()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    model = MLP(64, [256, 256, 128, 1])
+    flat = MLP(64, [256, 256, 128, 1])
+    flat.flatten_parameters()
+    n = len(model.parameters())
+    print(f"zero_grad + step over {n} parameters")
+    print(f"{'optimizer':>12} {'per-Value (ms)':>15} {'flat buffer (ms)':>17} {'speedup':>8}")
+    for cls in (SGD, SGDMomentum, Adam):
+        loop = step_time(cls(model.parameters()))
+        vectorized = step_time(cls(flat.parameters()))
+        print(f"{cls.__name__:>12} {loop * 1e3:15.2f} {vectorized * 1e3:17.3f} {loop / vectorized:7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Benchmark data-parallel training throughput against the number of workers
+"""
+import sys
+import os
+import time
+import random
+import multiprocessing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.neuralnet import MLP
+from mymicrograd.parallel import DataParallelTrainer
+from optimizers import SGD
+
+def squared_error(pred, y):
+    return (pred - y) ** 2
+
+def main(max_workers=None, samples=256, steps=3):
+    random.seed(0)
+    max_workers = max_workers or multiprocessing.cpu_count()
+    dataset = [([random.uniform(-1, 1) for _ in range(16)], random.uniform(-1, 1)) for _ in range(samples)]
+    print(f"MLP(16, [32, 32, 1]), {samples} samples per step, {multiprocessing.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'samples/s':>10} {'scaling':>8}")
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        model = MLP(16, [32, 32, 1])
+        with DataParallelTrainer(model, squared_error, SGD(model.parameters(), lr=0.01), workers=workers) as trainer:
+            trainer.step(dataset)  # warm up the pool
+            start = time.perf_counter()
+            for _ in range(steps):
+                trainer.step(dataset)
+            throughput = samples * steps / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:10.0f} {throughput / baseline:7.2f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
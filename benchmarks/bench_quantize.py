@@ -0,0 +1,42 @@
+"""
+Benchmark int8-quantized inference against the float64 batched forward
+"""
+import sys
+import os
+import time
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from mymicrograd.engine import no_grad
+from mymicrograd.neuralnet import MLP
+from mymicrograd.quantize import quantize
+
+def best_time(fn, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(width=256, batch_sizes=(1, 32, 256)):
+    random.seed(0)
+    model = MLP(width, [width, width, 1])
+    model.flatten_parameters()
+    quantized = quantize(model)
+    rng = np.random.default_rng(0)
+    float_bytes = len(model.parameters()) * 8
+    print(f"MLP({width}, [{width}, {width}, 1]) inference")
+    print(f"bytes: float64 {float_bytes}, int8 in memory {quantized.nbytes()}, "
+          f"int8 on disk {quantized.storage_nbytes()}")
+    print(f"{'batch':>6} {'float ms':>9} {'int8 ms':>9} {'speedup':>8}")
+    for n in batch_sizes:
+        X = rng.uniform(-1, 1, size=(n, width))
+        with no_grad():
+            reference = best_time(lambda: model.forward_batch(X))
+        got = best_time(lambda: quantized(X))
+        print(f"{n:>6} {reference * 1e3:9.3f} {got * 1e3:9.3f} {reference / got:7.2f}x")
+
+if __name__ == "__main__":
+    main()
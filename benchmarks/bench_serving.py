@@ -0,0 +1,45 @@
+"""
+Load-test the micro-batching inference server over a local socket
+"""
+import sys
+import os
+import json
+import time
+import random
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.neuralnet import MLP
+from mymicrograd.serving import InferenceServer
+
+async def client(port, inputs):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for x in inputs:
+        writer.write(json.dumps(x).encode() + b'\n')
+        await writer.drain()
+        await reader.readline()
+    writer.close()
+
+async def load_test(model, max_batch_size, clients, requests):
+    rng = random.Random(0)
+    async with InferenceServer(model, max_batch_size=max_batch_size) as server:
+        port = await server.serve()
+        workloads = [[[rng.uniform(-1, 1) for _ in range(16)] for _ in range(requests)] for _ in range(clients)]
+        start = time.perf_counter()
+        await asyncio.gather(*(client(port, inputs) for inputs in workloads))
+        elapsed = time.perf_counter() - start
+        stats = server.stats()
+    return clients * requests / elapsed, stats
+
+def main(clients=64, requests=50):
+    random.seed(0)
+    model = MLP(16, [32, 32, 1])
+    print(f"MLP(16, [32, 32, 1]), {clients} concurrent clients x {requests} requests")
+    print(f"{'max batch':>10} {'req/s':>8} {'mean batch':>11} {'p50 ms':>8} {'p99 ms':>8}")
+    for max_batch_size in (1, 8, 32, 64):
+        throughput, stats = asyncio.run(load_test(model, max_batch_size, clients, requests))
+        print(f"{max_batch_size:>10} {throughput:8.0f} {stats['mean_batch_size']:11.1f} "
+              f"{stats['p50_ms']:8.2f} {stats['p99_ms']:8.2f}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,190 @@
+"""
+Benchmark suite for the engine, neural network, losses and optimizers
+
+Each benchmark returns a flat dict of metrics. Metric names end in a unit
+suffix that also says which direction is better:
+  _s      seconds, lower is better
+  _per_s  rate, higher is better
+  _bytes  memory, lower is better
+"""
+import sys
+import os
+import gc
+import time
+import random
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from losses import MSELoss, CrossEntropyLoss, HingeLoss
+from optimizers import SGD, Adam
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a benchmark function under `name`"""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+def best_time(fn, repeat):
+    """Return the best wall time of `repeat` calls to fn"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(fn):
+    """Return the peak traced allocation while fn runs, in bytes"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _expression_graph(n):
+    """A chain of n blocks of mixed ops over 2 leaves"""
+    a = Value(0.3)
+    b = Value(-0.7)
+    total = Value(0.0)
+    for _ in range(n):
+        total = total + (a * b + a ** 2).tanh() - b.exp() * 0.1 + (a - b).relu()
+    return total
+
+@benchmark('engine')
+def bench_engine(quick):
+    n = 2000 if quick else 20000
+    repeat = 3 if quick else 5
+    nodes = len(_expression_graph(n).topo_order())
+    forward = best_time(lambda: _expression_graph(n), repeat)
+
+    root = _expression_graph(n)
+    topo = root.topo_order()
+    backward = best_time(lambda: root.backward(retain_graph=True), repeat)
+    cached = best_time(lambda: root.backward(topo=topo, retain_graph=True), repeat)
+    return {
+        'nodes_created_per_s': nodes / forward,
+        'forward_s': forward,
+        'backward_s': backward,
+        'backward_cached_topo_s': cached,
+        'graph_peak_bytes': peak_memory(lambda: _expression_graph(n)),
+    }
+
+def _mlp_step(model, X, y):
+    total = Value(0.0)
+    for xi, yi in zip(X, y):
+        total = total + (model([Value(v) for v in xi]) - yi) ** 2
+    model.zero_grad()
+    total.backward()
+
+def _mlp_batch_step(model, X, y):
+    loss = ((model.forward_batch(X) - y[:, None]) ** 2).sum()
+    model.zero_grad()
+    loss.backward()
+
+@benchmark('mlp')
+def bench_mlp(quick):
+    rng = random.Random(0)
+    repeat = 2 if quick else 3
+    results = {}
+    shapes = [('width', w, 2) for w in (8, 32, 128)] + [('depth', 16, d) for d in (1, 2, 4)]
+    batch = 4 if quick else 16
+    for kind, width, depth in shapes:
+        if quick and width > 32:
+            continue
+        model = MLP(16, [width] * depth + [1])
+        X = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(batch)]
+        y = [rng.uniform(-1, 1) for _ in range(batch)]
+        key = f"{kind}_{width if kind == 'width' else depth}"
+        results[f"{key}.forward_s"] = best_time(lambda: [model([Value(v) for v in xi]) for xi in X], repeat)
+        results[f"{key}.forward_backward_s"] = best_time(lambda: _mlp_step(model, X, y), repeat)
+
+    model = MLP(16, [32, 32, 1])
+    for n in ((1, 8) if quick else (1, 8, 32, 128)):
+        X = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(n)]
+        y = [rng.uniform(-1, 1) for _ in range(n)]
+        results[f"batch_{n}.samples_per_s"] = n / best_time(lambda: _mlp_step(model, X, y), repeat)
+        if np is not None:
+            Xa, ya = np.array(X), np.array(y)
+            results[f"batch_{n}.batched_samples_per_s"] = n / best_time(lambda: _mlp_batch_step(model, Xa, ya), repeat)
+    return results
+
+@benchmark('losses')
+def bench_losses(quick):
+    rng = random.Random(0)
+    n = 100 if quick else 1000
+    repeat = 3 if quick else 5
+    targets = [rng.choice((-1.0, 1.0)) for _ in range(n)]
+    results = {}
+    for loss_fn in (MSELoss(), CrossEntropyLoss(), HingeLoss()):
+        def step():
+            preds = [Value(rng.uniform(-1, 1)) for _ in range(n)]
+            loss_fn(preds, targets).backward()
+        name = type(loss_fn).__name__
+        try:
+            results[f"{name}.forward_backward_s"] = best_time(step, repeat)
+        except Exception as e:
+            # Report a broken loss without losing the rest of the run
+            print(f"skipping {name}: {type(e).__name__}: {e}", file=sys.stderr)
+    return results
+
+@benchmark('optimizers')
+def bench_optimizers(quick):
+    repeat = 3 if quick else 5
+    results = {}
+    for count in ((1000, 10000) if quick else (1000, 10000, 100000)):
+        params = [Value(random.uniform(-1, 1)) for _ in range(count)]
+        for p in params:
+            p.grad = 0.01
+        for cls in (SGD, Adam):
+            optimizer = cls(params)
+            results[f"{cls.__name__}_{count}.step_s"] = best_time(optimizer.step, repeat)
+        if np is not None:
+            from mymicrograd.buffer import ParameterBuffer
+            ParameterBuffer(params)
+            for cls in (SGD, Adam):
+                optimizer = cls(params)
+                results[f"{cls.__name__}_{count}.flat_step_s"] = best_time(optimizer.step, repeat)
+    return results
+
+def run(names=None, quick=False):
+    """Run the selected benchmarks and return {'<benchmark>.<metric>': value}"""
+    results = {}
+    for name, fn in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for metric, value in fn(quick).items():
+            results[f"{name}.{metric}"] = value
+    return results
+
+def lower_is_better(metric):
+    return not metric.endswith('_per_s')
+
+def compare(current, previous, threshold=0.10):
+    """Return (metric, previous, current, relative change, regressed) for shared metrics.
+
+    The relative change is positive when the metric got worse; a metric
+    regressed when it got worse by more than `threshold`.
+    """
+    rows = []
+    for metric in sorted(set(current) & set(previous)):
+        old, new = previous[metric], current[metric]
+        if not old:
+            continue
+        change = (new - old) / old
+        if not lower_is_better(metric):
+            change = -change
+        rows.append((metric, old, new, change, change > threshold))
+    return rows
@@ -2,8 +2,8 @@
 Example usage of the mini neural network framework
 """
 
-from mymicrograd.engine import Value
 from mymicrograd.neuralnet import MLP
+from mymicrograd.trainer import Trainer
 from optimizers import SGD, Adam
 from losses import MSELoss
 
@@ -24,28 +24,14 @@ def example_training():
         ([1.0, 1.0], 0.0)
     ]
     
-    # Training loop
+    # Training loop: the trainer backpropagates each sample as it goes, so
+    # only one sample's graph is alive at a time
+    trainer = Trainer(mlp, lambda pred, target: loss_fn([pred], [target]), optimizer)
     for epoch in range(100):
-        total_loss = Value(0.0)
-        
-        for x_data, y_target in dataset:
-            # Forward pass
-            x = [Value(xi) for xi in x_data]
-            y_pred = mlp(x)
-            
-            # Compute loss
-            loss = loss_fn([y_pred], [y_target])
-            total_loss = total_loss + loss
-        
-        # Backward pass
-        optimizer.zero_grad()
-        total_loss.backward()
-        
-        # Update parameters
-        optimizer.step()
+        total_loss = trainer.step(dataset)
         
         if epoch % 20 == 0:
-            print(f"Epoch {epoch}, Loss: {total_loss.data:.4f}")
+            print(f"Epoch {epoch}, Loss: {total_loss:.4f}")
 
 if __name__ == "__main__":
     example_training()
\ No newline at end of file
@@ -2,70 +2,52 @@
 Loss functions for the mini neural network framework
 """
 from mymicrograd.engine import Value
-import math
+
+try:
+    from mymicrograd.tensor import Tensor
+except ImportError:  # NumPy is optional; without it losses only take Values
+    Tensor = None
 
 class Loss:
     """Base loss class"""
     def __call__(self, predictions, targets):
         raise NotImplementedError
 
+def _is_batch(predictions):
+    return Tensor is not None and isinstance(predictions, Tensor)
+
+def _as_lists(predictions, targets):
+    if not isinstance(predictions, (list, tuple)):
+        predictions = [predictions]
+    if not isinstance(targets, (list, tuple)):
+        targets = [targets]
+    return predictions, targets
+
+# Each loss is a single fused node (Value.mse_loss etc.) over all pairs, or
+# over every element when the predictions are a batched Tensor.
+
 class MSELoss(Loss):
     """Mean Squared Error Loss"""
     def __call__(self, predictions, targets):
-        if not isinstance(predictions, list):
-            predictions = [predictions]
-        if not isinstance(targets, list):
-            targets = [targets]
-        
-        loss = Value(0.0)
-        for pred, target in zip(predictions, targets):
-            if not isinstance(target, Value):
-                target = Value(target)
-            diff = pred - target
-            loss = loss + diff * diff
-        
-        return loss * Value(1.0 / len(predictions))
+        if _is_batch(predictions):
+            return predictions.mse_loss(targets)
+        return Value.mse_loss(*_as_lists(predictions, targets))
 
 class CrossEntropyLoss(Loss):
-    """Cross Entropy Loss (simplified for binary classification)"""
+    """Binary cross-entropy on logits: predictions are raw scores, targets are 0 or 1.
+
+    The sigmoid is folded into the loss (BCE with logits) and evaluated in
+    log-sum-exp form, so large logits neither overflow nor lose precision.
+    """
     def __call__(self, predictions, targets):
-        if not isinstance(predictions, list):
-            predictions = [predictions]
-        if not isinstance(targets, list):
-            targets = [targets]
-        
-        loss = Value(0.0)
-        for pred, target in zip(predictions, targets):
-            if not isinstance(target, Value):
-                target = Value(target)
-            
-            # Apply sigmoid to get probabilities
-            sigmoid_pred = Value(1.0) / (Value(1.0) + (pred * Value(-1.0)).exp())
-            
-            # Cross entropy: -[y*log(p) + (1-y)*log(1-p)]
-            # Simplified version to avoid log (which we haven't implemented)
-            # Using approximation: -y*p - (1-y)*(1-p) (not exact but for demo)
-            loss_term = target * sigmoid_pred * Value(-1.0) - (Value(1.0) - target) * (Value(1.0) - sigmoid_pred)
-            loss = loss + loss_term
-        
-        return loss * Value(1.0 / len(predictions))
+        if _is_batch(predictions):
+            return predictions.bce_with_logits(targets)
+        return Value.bce_with_logits(*_as_lists(predictions, targets))
 
 class HingeLoss(Loss):
     """Hinge Loss for SVM-style classification"""
     def __call__(self, predictions, targets):
-        if not isinstance(predictions, list):
-            predictions = [predictions]
-        if not isinstance(targets, list):
-            targets = [targets]
-        
-        loss = Value(0.0)
-        for pred, target in zip(predictions, targets):
-            if not isinstance(target, Value):
-                target = Value(target)
-            
-            # Hinge loss: max(0, 1 - y*pred)
-            margin = Value(1.0) - target * pred
-            hinge = margin.relu()  # max(0, margin)
-            loss = loss + hinge
-        
-        return loss * Value(1.0 / len(predictions))
\ No newline at end of file
+        # Hinge loss: max(0, 1 - y*pred), for targets of -1 or +1
+        if _is_batch(predictions):
+            return predictions.hinge_loss(targets)
+        return Value.hinge_loss(*_as_lists(predictions, targets))
@@ -2,7 +2,19 @@
 MyMicrograd - A mini neural network framework
 """
 
-from .engine import Value
+from .engine import Value, no_grad, is_grad_enabled, profile, set_default_dtype, get_default_dtype, parameters_changed
 from .neuralnet import Neuron, Layer, MLP, Module
+from .compiler import compile
+from .serialization import save, load
+from .trainer import Trainer, accumulate_grad
+from .forward import Dual, jvp
+from .cache import InferenceCache
 
-__all__ = ['Value', 'Neuron', 'Layer', 'MLP', 'Module']
\ No newline at end of file
+__all__ = ['Value', 'no_grad', 'is_grad_enabled', 'profile', 'set_default_dtype', 'get_default_dtype', 'parameters_changed', 'Neuron', 'Layer', 'MLP', 'Module', 'compile', 'save', 'load', 'Trainer', 'accumulate_grad', 'Dual', 'jvp', 'InferenceCache']
+
+# The array-backed Tensor needs NumPy, which stays an optional dependency
+try:
+    from .tensor import Tensor
+    __all__.append('Tensor')
+except ImportError:
+    pass
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Flat contiguous storage for a module's parameters
+"""
+import numpy as np
+from . import engine
+from .engine import Value
+
+class BufferedValue(Value):
+    """A parameter Value whose data and grad live in a ParameterBuffer.
+
+    It adds no slots, so an existing Value can be switched to this class in
+    place and every graph, module and optimizer holding it keeps working.
+    As a leaf it never uses `_arg`, which here holds (buffer, index).
+    """
+    __slots__ = ()
+
+    # Element access goes through memoryviews of the arrays, which read and
+    # write Python floats without creating a NumPy scalar per access
+
+    @property
+    def data(self):
+        buf, i = self._arg
+        return buf._data_view[i]
+
+    @data.setter
+    def data(self, value):
+        buf, i = self._arg
+        buf._data_view[i] = value
+
+    @property
+    def grad(self):
+        buf, i = self._arg
+        return buf._grad_view[i]
+
+    @grad.setter
+    def grad(self, value):
+        buf, i = self._arg
+        buf._grad_view[i] = value
+
+class ParameterBuffer:
+    """One data array and one grad array backing a list of parameters.
+
+    The given Values become views into the arrays, so the optimizers can
+    update every parameter with a few array operations and zero_grad() is a
+    single fill. The arrays use `dtype`, by default engine.get_default_dtype();
+    the Values still read and write Python floats.
+    """
+    def __init__(self, parameters, dtype=None):
+        params = list(parameters)
+        if len(set(map(id, params))) != len(params):
+            raise ValueError("parameters must not contain duplicates")
+        for p in params:
+            if type(p) is not Value:
+                raise TypeError(f"can only buffer plain Value parameters, not {type(p).__name__}")
+        self.parameters = params
+        dtype = dtype or engine._default_dtype
+        self.data = np.array([p.data for p in params], dtype=dtype)
+        self.grad = np.array([p.grad for p in params], dtype=dtype)
+        # Optimizers update the arrays in place, so these views stay valid
+        self._data_view = memoryview(self.data)
+        self._grad_view = memoryview(self.grad)
+        self._spans = {}
+        for i, p in enumerate(params):
+            p.__class__ = BufferedValue
+            p._arg = (self, i)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def zero_grad(self):
+        self.grad.fill(0.0)
+
+    def zeros(self):
+        """Return a zero array shaped like the buffer, e.g. for optimizer state"""
+        return np.zeros_like(self.data)
+
+    def span(self, params):
+        """Return the start index if `params` occupy consecutive slots, else None"""
+        if not params or not isinstance(params[0], BufferedValue) or params[0]._arg[0] is not self:
+            return None
+        key = tuple(map(id, params))
+        if key not in self._spans:
+            start = params[0]._arg[1]
+            own = self.parameters[start:start + len(params)]
+            self._spans[key] = start if len(own) == len(params) and all(a is b for a, b in zip(own, params)) else None
+        return self._spans[key]
+
+    def release(self):
+        """Turn the parameters back into standalone Values holding their current values"""
+        for p, data, grad in zip(self.parameters, self.data.tolist(), self.grad.tolist()):
+            p.__class__ = Value
+            p._arg = None
+            p.data = data
+            p.grad = grad
+        self.parameters = []
+        self._spans.clear()
+
+def find_buffer(parameters):
+    """Return the ParameterBuffer backing exactly `parameters`, in order, or None"""
+    if not parameters or not isinstance(parameters[0], BufferedValue):
+        return None
+    buf = parameters[0]._arg[0]
+    return buf if len(buf) == len(parameters) and buf.span(parameters) == 0 else None
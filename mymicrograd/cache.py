@@ -0,0 +1,124 @@
+"""
+LRU cache of model predictions for inputs that repeat
+"""
+import time
+from collections import OrderedDict
+from . import engine
+from .engine import Value, no_grad
+
+class InferenceCache:
+    """Wrap a Module so repeated input vectors skip the forward pass.
+
+    Calling the cache with a list of numbers (or Values) returns what the
+    model would: a Value, or a list of Values for several outputs. Misses
+    run the model under no_grad(), so no graph is built, and store the
+    output floats; hits return fresh leaf Values holding them.
+
+    Inputs are keyed by their values, rounded to `decimals` places when
+    given; the model then sees the rounded vector, so an entry does not
+    depend on which of the inputs sharing its key came first. At most
+    `maxsize` entries are kept, least recently used first out, and with
+    `ttl` seconds set an entry older than that is recomputed.
+
+    All entries are dropped when parameter values change. By default that
+    is detected in O(1) from engine.parameters_changed(), which the
+    optimizers' step() and Module.load_state_dict() call; any step, even
+    of another model, clears the cache. Call parameters_changed() (or
+    invalidate()) after editing parameters by hand. With snapshot=True
+    every call instead compares all parameter values with those the
+    entries were computed from, which also catches such edits but reads
+    every parameter per lookup (a single buffer copy on a flattened
+    module). In that mode, build the cache after any change to the model's
+    structure (such as prune()), since the parameter list is taken once.
+    """
+    def __init__(self, model, maxsize=1024, ttl=None, decimals=None, snapshot=False, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, not {maxsize}")
+        self.model = model
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.decimals = decimals
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.snapshot = snapshot
+        self._entries = OrderedDict()
+        self._version = engine._parameter_version
+        if snapshot:
+            self._params = model.parameters()
+            self._arrays = any(hasattr(p.data, 'tobytes') for p in self._params)
+            self._snapshot = self._parameter_snapshot()
+
+    def _parameter_snapshot(self):
+        buffer = getattr(self.model, '_buffer', None)
+        if buffer is not None and len(buffer):
+            return buffer.data.tobytes()
+        if self._arrays:
+            # Tensor parameters are updated in place, so copy their bytes
+            return [p.data.tobytes() if hasattr(p.data, 'tobytes') else p.data for p in self._params]
+        return [p.data for p in self._params]
+
+    def _key(self, x):
+        values = [v.data if isinstance(v, Value) else float(v) for v in x]
+        if self.decimals is not None:
+            values = [round(v, self.decimals) for v in values]
+        return tuple(values)
+
+    def __call__(self, x):
+        if engine._parameter_version != self._version:
+            self.invalidate()
+            self._version = engine._parameter_version
+        if self.snapshot:
+            snapshot = self._parameter_snapshot()
+            if snapshot != self._snapshot:
+                self.invalidate()
+                self._snapshot = snapshot
+        key = self._key(x)
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, outputs = entry
+            if expires is None or now < expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._wrap(outputs)
+            del self._entries[key]
+            self.expirations += 1
+        self.misses += 1
+        with no_grad():
+            out = self.model([Value(v) for v in key])
+        outputs = (out.data,) if isinstance(out, Value) else tuple(o.data for o in out)
+        self._entries[key] = (None if self.ttl is None else now + self.ttl, outputs)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return self._wrap(outputs)
+
+    @staticmethod
+    def _wrap(outputs):
+        return Value(outputs[0]) if len(outputs) == 1 else [Value(v) for v in outputs]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self):
+        """Drop every cached prediction"""
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """Return hit/miss counters, the hit rate and how entries left the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
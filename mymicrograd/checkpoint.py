@@ -0,0 +1,86 @@
+"""
+Activation checkpointing: recompute segments of a model during backward
+"""
+from . import engine
+from .engine import Value, _BACKWARD
+
+def _as_list(out):
+    return list(out) if isinstance(out, (list, tuple)) else [out]
+
+def checkpoint(fn, inputs):
+    """Run fn(inputs) without keeping its graph, recomputing it during backward.
+
+    The forward pass runs under no_grad(), so only fn's outputs are stored.
+    They hang off one 'checkpoint' node whose children are `inputs`; when
+    backward reaches that node it reruns fn on copies of the inputs with the
+    graph enabled, backpropagates the outputs' gradients through it and
+    adds the result into the inputs' and the parameters' grads. Peak memory
+    is one segment's graph at a time, at the cost of a second forward.
+
+    fn takes a list of Values and returns a Value or a list of Values, like
+    Layer.__call__. With the graph disabled this is just fn(inputs).
+    """
+    inputs = [x if isinstance(x, Value) else Value(x) for x in inputs]
+    if not engine._grad_mode.enabled:
+        return fn(inputs)
+    with engine.no_grad():
+        out = fn([Value(x.data) for x in inputs])
+    outs = _as_list(out)
+
+    segment = Value(0.0, inputs, 'checkpoint')
+    # Output gradients are gathered here by the 'unpack' nodes before the
+    # segment's own backward runs
+    segment._arg = (fn, [0.0] * len(outs))
+    results = []
+    for i, o in enumerate(outs):
+        r = Value(o.data, (segment,), 'unpack')
+        r._arg = i
+        results.append(r)
+    return results if isinstance(out, (list, tuple)) else results[0]
+
+def checkpoint_sequential(layers, x, segments):
+    """Run x through `layers` in order, checkpointing them in `segments` contiguous groups.
+
+    For an MLP use checkpoint_sequential(mlp.layers, x, segments). More
+    segments keep more boundary activations but recompute less at a time;
+    segments=1 stores only the input and the output.
+    """
+    layers = list(layers)
+    if not 1 <= segments <= len(layers):
+        raise ValueError(f"segments must be between 1 and {len(layers)}, not {segments}")
+    size, extra = divmod(len(layers), segments)
+    start = 0
+    for s in range(segments):
+        stop = start + size + (s < extra)
+        group = layers[start:stop]
+        def run(inputs, group=group):
+            for layer in group:
+                inputs = layer(inputs)
+            return inputs
+        x = checkpoint(run, _as_list(x))
+        start = stop
+    return x
+
+def _unpack_backward(out):
+    segment, = out._prev
+    segment._arg[1][out._arg] += out.grad
+
+def _checkpoint_backward(segment):
+    fn, grads = segment._arg
+    inputs = segment._prev
+    copies = [Value(x.data) for x in inputs]
+    mode = engine._grad_mode
+    enabled = mode.enabled
+    mode.enabled = True
+    try:
+        outs = _as_list(fn(copies))
+        # One backward through sum(grad_i * out_i) seeds every output at once
+        Value.dot(outs, grads).backward()
+    finally:
+        mode.enabled = enabled
+    for x, c in zip(inputs, copies):
+        x.grad += c.grad
+    grads[:] = [0.0] * len(grads)
+
+_BACKWARD['unpack'] = _unpack_backward
+_BACKWARD['checkpoint'] = _checkpoint_backward
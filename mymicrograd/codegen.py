@@ -0,0 +1,179 @@
+"""
+Generate straight-line Python (or NumPy) code from a traced Tape
+"""
+import math
+from .engine import _softplus, _sigmoid
+
+# Generated functions, keyed by (graph signature, backend)
+_CACHE = {}
+
+def _python_relu(x):
+    return 0 if x < 0 else x
+
+def _identity(x):
+    return x
+
+def _namespace(use_numpy):
+    if use_numpy:
+        import numpy as np
+        return {'exp': np.exp, 'relu': lambda x: np.maximum(x, 0.0), 'total': np.sum,
+                'softplus': lambda x: np.logaddexp(0.0, x),
+                'sigmoid': lambda x: 0.5*(np.tanh(0.5*x) + 1.0)}
+    return {'exp': math.exp, 'relu': _python_relu, 'total': _identity,
+            'softplus': _softplus, 'sigmoid': _sigmoid}
+
+def _pairs(args, n):
+    return zip([f"v{a}" for a in args[:n]], [f"v{a}" for a in args[n:]])
+
+# Terms per generated statement: one long a*b + c*d + ... expression
+# nests deeper than CPython's compiler allows for a wide layer
+_CHUNK = 64
+
+def _sum_terms(op, args, arg):
+    """Return the terms of a summing op ('dot' and the fused losses), else None"""
+    if op == 'dot':
+        v = [f"v{a}" for a in args]
+        return [f"{w}*{x}" for w, x in zip(v[:arg], v[arg:2*arg])] + v[2*arg:]
+    if op == 'mse':
+        return [f"({p} - {t})**2" for p, t in _pairs(args, arg)]
+    if op == 'bce':
+        return [f"softplus({z}) - {z}*{y}" for z, y in _pairs(args, arg)]
+    if op == 'hinge':
+        return [f"relu(1.0 - {t}*{p})" for p, t in _pairs(args, arg)]
+    return None
+
+def _forward_lines(op, o, args, arg):
+    """Yield the statements that compute one instruction into v{o}"""
+    terms = _sum_terms(op, args, arg)
+    if terms is None:
+        yield f"    v{o} = {_forward_expr(op, args, arg)}"
+        return
+    if not terms:
+        yield f"    v{o} = 0"
+        return
+    # Accumulating chunk by chunk keeps the eager left-to-right summation order
+    for start in range(0, len(terms), _CHUNK):
+        chunk = " + ".join(terms[start:start + _CHUNK])
+        yield f"    v{o} = {chunk}" if start == 0 else f"    v{o} = v{o} + {chunk}"
+    if op != 'dot':
+        yield f"    v{o} = v{o} / {arg}"
+
+def _forward_expr(op, args, arg):
+    v = [f"v{a}" for a in args]
+    if op == '+':
+        return f"{v[0]} + {v[1]}"
+    if op == '*':
+        return f"{v[0]} * {v[1]}"
+    if op == '+c':
+        return f"{v[0]} + {float(arg)!r}"
+    if op == '*c':
+        return f"{v[0]} * {float(arg)!r}"
+    if op == '/':
+        return f"{v[0]} / {v[1]}"
+    if op == 'c/':
+        return f"{float(arg)!r} / {v[0]}"
+    if op == 'tanh':
+        return f"(exp(2*{v[0]})-1)/(exp(2*{v[0]})+1)"
+    if op == '**':
+        return f"{v[0]} ** {arg!r}"
+    if op == 'exp':
+        return f"exp({v[0]})"
+    if op == 'ReLU':
+        return f"relu({v[0]})"
+    raise NotImplementedError(f"cannot generate code for op {op!r}")
+
+def _backward_terms(op, o, args, arg):
+    """Yield (operand slot, gradient expression) pairs for one instruction"""
+    g = f"g{o}"
+    if op == 'dot':
+        n = arg
+        for w, x in zip(args[:n], args[n:2*n]):
+            yield w, f"v{x}*{g}"
+            yield x, f"v{w}*{g}"
+        for b in args[2*n:]:
+            yield b, g
+    elif op == '+':
+        yield args[0], g
+        yield args[1], g
+    elif op == '*':
+        yield args[0], f"v{args[1]}*{g}"
+        yield args[1], f"v{args[0]}*{g}"
+    elif op == '+c':
+        yield args[0], g
+    elif op == '*c':
+        yield args[0], f"{float(arg)!r}*{g}"
+    elif op == '/':
+        yield args[0], f"{g}/v{args[1]}"
+        yield args[1], f"-v{o}/v{args[1]}*{g}"
+    elif op == 'c/':
+        yield args[0], f"-v{o}/v{args[0]}*{g}"
+    elif op == 'tanh':
+        yield args[0], f"(1 - v{o}**2)*{g}"
+    elif op == '**':
+        yield args[0], f"({arg!r}*(v{args[0]}**{arg - 1!r}))*{g}"
+    elif op == 'exp':
+        yield args[0], f"v{o}*{g}"
+    elif op == 'ReLU':
+        yield args[0], f"(v{o}>0)*{g}"
+    elif op == 'mse':
+        for p, t in zip(args[:arg], args[arg:]):
+            yield p, f"(v{p} - v{t})*(2.0*{g}/{arg})"
+            yield t, f"(v{t} - v{p})*(2.0*{g}/{arg})"
+    elif op == 'bce':
+        for z, y in zip(args[:arg], args[arg:]):
+            yield z, f"(sigmoid(v{z}) - v{y})*({g}/{arg})"
+            yield y, f"-v{z}*({g}/{arg})"
+    elif op == 'hinge':
+        for p, t in zip(args[:arg], args[arg:]):
+            yield p, f"-((v{t}*v{p} < 1.0)*v{t})*({g}/{arg})"
+            yield t, f"-((v{t}*v{p} < 1.0)*v{p})*({g}/{arg})"
+
+def generate_source(tape, name='step'):
+    """Return the source of `name(params, inputs) -> (output, param_grads)`.
+
+    The function is the tape's forward and backward unrolled into one
+    assignment per node, with constants inlined and no op dispatch left.
+    The same source runs on floats or, with NumPy names bound, on arrays
+    holding one value per sample.
+    """
+    lines = [f"def {name}(params, inputs):"]
+    for k, slot in enumerate(tape.param_slots):
+        if slot >= 0:
+            lines.append(f"    v{slot} = params[{k}]")
+    for k, slot in enumerate(tape.input_slots):
+        if slot >= 0:
+            lines.append(f"    v{slot} = inputs[{k}]")
+    for slot, value in tape.constants:
+        lines.append(f"    v{slot} = {float(value)!r}")
+
+    for op, o, args, arg in tape.ops:
+        lines.extend(_forward_lines(op, o, args, arg))
+
+    lines.append(f"    g{tape.output} = 1.0")
+    seen = {tape.output}
+    for op, o, args, arg in reversed(tape.ops):
+        for slot, expr in _backward_terms(op, o, args, arg):
+            if slot in seen:
+                lines.append(f"    g{slot} = g{slot} + {expr}")
+            else:
+                lines.append(f"    g{slot} = {expr}")
+                seen.add(slot)
+
+    grads = [f"total(g{slot})" if slot in seen else "0.0" for slot in tape.param_slots]
+    lines.append(f"    return total(v{tape.output}), [{', '.join(grads)}]")
+    return "\n".join(lines) + "\n"
+
+def generate(tape, use_numpy=False):
+    """Return the generated function for a tape, reusing it for equal graphs"""
+    key = (tape.signature(), use_numpy)
+    fn = _CACHE.get(key)
+    if fn is None:
+        namespace = _namespace(use_numpy)
+        code = compile(generate_source(tape), '<mymicrograd-codegen>', 'exec')
+        exec(code, namespace)
+        fn = _CACHE[key] = namespace['step']
+    return fn
+
+def clear_cache():
+    """Drop every cached generated function"""
+    _CACHE.clear()
@@ -0,0 +1,266 @@
+"""
+Trace-and-replay compiler for training steps of a fixed-structure model
+"""
+import math
+from operator import itemgetter, mul
+from .engine import Value, _softplus, _sigmoid
+
+class Tape:
+    """Flat record of one traced forward graph.
+
+    Every node of the graph gets a slot in the preallocated `data` and `grad`
+    lists, and every interior node becomes an instruction
+    (op code, output slot, operand slots, extra operand). Replaying the tape
+    recomputes the same graph for new parameter and input values without
+    creating a single Value.
+    """
+    def __init__(self, root, params, inputs):
+        topo = root.topo_order()
+        index = {node: i for i, node in enumerate(topo)}
+        self.size = len(topo)
+        # Leaves that are neither parameters nor inputs keep their traced value
+        self.data = [node.data for node in topo]
+        self.grad = [0.0] * self.size
+        self._zeros = [0.0] * self.size
+        self.param_slots = [index.get(p, -1) for p in params]
+        self.input_slots = [index.get(v, -1) for v in inputs]
+        self.output = index[root]
+        bound = set(self.param_slots) | set(self.input_slots)
+        self.constants = tuple((i, node.data) for i, node in enumerate(topo)
+                               if not node._op and i not in bound)
+        # ops is the plain structural record; instrs is the same sequence with
+        # dot operands pre-split for the replay loops
+        self.ops = []
+        self.instrs = []
+        for node in topo:
+            if not node._op:
+                continue
+            if node._op not in _SUPPORTED_OPS:
+                raise NotImplementedError(f"cannot compile op {node._op!r}")
+            args = tuple(index[c] for c in node._prev)
+            arg = node._arg
+            self.ops.append((node._op, index[node], args, arg))
+            if node._op == 'dot':
+                # Pre-split the operand slots and build C-level gathers for them
+                n = arg
+                ws, xs = args[:n], args[n:2*n]
+                bias = args[2*n] if len(args) > 2*n else -1
+                arg = (ws, xs, bias, _gather(ws), _gather(xs))
+            self.instrs.append((node._op, index[node], args, arg))
+
+    def signature(self):
+        """Return a hashable description of the graph structure"""
+        return (self.size, self.output, tuple(self.param_slots), tuple(self.input_slots),
+                self.constants, tuple(self.ops))
+
+    def load(self, param_values, input_values):
+        """Write parameter and input values into their data slots"""
+        D = self.data
+        for slot, value in zip(self.param_slots, param_values):
+            if slot >= 0:
+                D[slot] = value
+        for slot, value in zip(self.input_slots, input_values):
+            if slot >= 0:
+                D[slot] = value
+
+    def forward(self):
+        """Replay the forward pass and return the output value"""
+        D = self.data
+        for op, o, args, arg in self.instrs:
+            if op == 'dot':
+                ws, xs, bias, get_ws, get_xs = arg
+                acc = sum(map(mul, get_ws(D), get_xs(D)))
+                if bias >= 0:
+                    acc = acc + D[bias]
+                D[o] = acc
+            elif op == '+':
+                D[o] = D[args[0]] + D[args[1]]
+            elif op == '*':
+                D[o] = D[args[0]] * D[args[1]]
+            elif op == '+c':
+                D[o] = D[args[0]] + arg
+            elif op == '*c':
+                D[o] = D[args[0]] * arg
+            elif op == '/':
+                D[o] = D[args[0]] / D[args[1]]
+            elif op == 'c/':
+                D[o] = arg / D[args[0]]
+            elif op == 'tanh':
+                x = D[args[0]]
+                D[o] = (math.exp(2*x)-1)/(math.exp(2*x)+1)
+            elif op == '**':
+                D[o] = D[args[0]] ** arg
+            elif op == 'exp':
+                D[o] = math.exp(D[args[0]])
+            elif op == 'ReLU':
+                x = D[args[0]]
+                D[o] = 0 if x < 0 else x
+            elif op == 'mse':
+                D[o] = sum((D[p] - D[t])**2 for p, t in zip(args[:arg], args[arg:])) / arg
+            elif op == 'bce':
+                D[o] = sum(_softplus(D[z]) - D[z]*D[y] for z, y in zip(args[:arg], args[arg:])) / arg
+            elif op == 'hinge':
+                D[o] = sum(max(0.0, 1.0 - D[t]*D[p]) for p, t in zip(args[:arg], args[arg:])) / arg
+        return D[self.output]
+
+    def backward(self):
+        """Replay the backward pass into the grad slots"""
+        D = self.data
+        G = self.grad
+        G[:] = self._zeros
+        G[self.output] = 1.0
+        for op, o, args, arg in reversed(self.instrs):
+            g = G[o]
+            if op == 'dot':
+                ws, xs, bias, get_ws, get_xs = arg
+                for w, xv in zip(ws, get_xs(D)):
+                    G[w] += xv*g
+                for x, wv in zip(xs, get_ws(D)):
+                    G[x] += wv*g
+                if bias >= 0:
+                    G[bias] += g
+            elif op == '+':
+                G[args[0]] += g
+                G[args[1]] += g
+            elif op == '*':
+                a, b = args
+                G[a] += D[b]*g
+                G[b] += D[a]*g
+            elif op == '+c':
+                G[args[0]] += g
+            elif op == '*c':
+                G[args[0]] += arg*g
+            elif op == '/':
+                a, b = args
+                G[a] += g/D[b]
+                G[b] -= D[o]/D[b]*g
+            elif op == 'c/':
+                a = args[0]
+                G[a] -= D[o]/D[a]*g
+            elif op == 'tanh':
+                G[args[0]] += (1 - D[o]**2)*g
+            elif op == '**':
+                a = args[0]
+                G[a] += (arg*(D[a]**(arg-1)))*g
+            elif op == 'exp':
+                G[args[0]] += D[o]*g
+            elif op == 'ReLU':
+                G[args[0]] += (D[o]>0)*g
+            elif op == 'mse':
+                scale = 2.0*g/arg
+                for p, t in zip(args[:arg], args[arg:]):
+                    d = (D[p] - D[t])*scale
+                    G[p] += d
+                    G[t] -= d
+            elif op == 'bce':
+                scale = g/arg
+                for z, y in zip(args[:arg], args[arg:]):
+                    G[z] += (_sigmoid(D[z]) - D[y])*scale
+                    G[y] -= D[z]*scale
+            elif op == 'hinge':
+                scale = g/arg
+                for p, t in zip(args[:arg], args[arg:]):
+                    if D[t]*D[p] < 1.0:
+                        G[p] -= D[t]*scale
+                        G[t] -= D[p]*scale
+
+def _gather(slots):
+    """Return a function mapping a slot list to a tuple of the given slots"""
+    if len(slots) == 1:
+        slot = slots[0]
+        return lambda D: (D[slot],)
+    return itemgetter(*slots)
+
+_SUPPORTED_OPS = frozenset(['dot', '+', '*', '+c', '*c', '/', 'c/', 'tanh', '**', 'exp', 'ReLU', 'mse', 'bce', 'hinge'])
+
+def _flatten(values):
+    return list(values) if isinstance(values, (list, tuple)) else [values]
+
+class CompiledStep:
+    """A model plus loss whose forward+backward is traced once and replayed.
+
+    Calling it with an input sample `x` and target `y` returns the loss as a
+    float and adds the parameter gradients into each parameter's `.grad`,
+    just like building the graph and calling `loss.backward()` would. The
+    first call traces the graph; later calls replay it. The model's
+    structure must not depend on the data, which holds for Neuron, Layer and
+    MLP.
+
+    backend selects how the trace is replayed: 'tape' interprets the tape,
+    'python' runs straight-line code generated from it, and 'numpy' runs the
+    same generated code over arrays, so `x` is an (N, nin) batch and `y` holds
+    N targets; the returned loss and the gradients are summed over the batch.
+    """
+    BACKENDS = ('tape', 'python', 'numpy')
+
+    def __init__(self, model, loss_fn, backend='tape'):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, not {backend!r}")
+        self.model = model
+        self.loss_fn = loss_fn
+        self.backend = backend
+        self.parameters = model.parameters()
+        self.tape = None
+        self._fn = None
+
+    def trace(self, x, y):
+        """Run the eager model once on Values and record the tape"""
+        xs = [Value(xi) for xi in _flatten(x)]
+        ys = [Value(yi) for yi in _flatten(y)]
+        target = ys if isinstance(y, (list, tuple)) else ys[0]
+        loss = self.loss_fn(self.model(xs), target)
+        self.tape = Tape(loss, self.parameters, xs + ys)
+        self._num_inputs = len(xs) + len(ys)
+        if self.backend != 'tape':
+            from .codegen import generate
+            self._fn = generate(self.tape, use_numpy=self.backend == 'numpy')
+        return self.tape
+
+    def _inputs(self, x, y):
+        """Flatten a call's arguments into the tape's input order, tracing on first use"""
+        if self.backend == 'numpy':
+            import numpy as np
+            X = np.asarray(x, dtype=np.float64)
+            Y = np.asarray(y, dtype=np.float64)
+            if self.tape is None:
+                self.trace(X[0].tolist(), Y[0].tolist() if Y.ndim > 1 else float(Y[0]))
+            inputs = list(X.T) + (list(Y.T) if Y.ndim > 1 else [Y])
+        else:
+            inputs = _flatten(x) + _flatten(y)
+            if self.tape is None:
+                self.trace(x, y)
+        if len(inputs) != self._num_inputs:
+            raise ValueError(f"compiled for {self._num_inputs} inputs, got {len(inputs)}")
+        return inputs
+
+    def forward(self, x, y):
+        """Replay only the forward pass and return the loss"""
+        inputs = self._inputs(x, y)
+        if self._fn is not None:
+            return float(self._fn([p.data for p in self.parameters], inputs)[0])
+        tape = self.tape
+        tape.load([p.data for p in self.parameters], inputs)
+        return tape.forward()
+
+    def __call__(self, x, y):
+        inputs = self._inputs(x, y)
+        params = self.parameters
+        if self._fn is not None:
+            loss, grads = self._fn([p.data for p in params], inputs)
+            for p, g in zip(params, grads):
+                p.grad += float(g)
+            return float(loss)
+
+        tape = self.tape
+        tape.load([p.data for p in params], inputs)
+        loss = tape.forward()
+        tape.backward()
+        G = tape.grad
+        for p, slot in zip(params, tape.param_slots):
+            if slot >= 0:
+                p.grad += G[slot]
+        return loss
+
+def compile(model, loss_fn, backend='tape'):
+    """Compile `loss_fn(model(x), y)` into a replayable training step"""
+    return CompiledStep(model, loss_fn, backend)
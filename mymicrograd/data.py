@@ -0,0 +1,128 @@
+"""
+Mini-batch loading from in-memory or memory-mapped arrays
+"""
+import queue
+import threading
+import numpy as np
+from . import engine
+from .engine import Value
+
+def _open(source, mmap):
+    """Accept an array or a path to a .npy file, memory-mapping paths"""
+    if source is None or isinstance(source, np.ndarray):
+        return source
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        return np.load(source, mmap_mode='r' if mmap else None)
+    return np.asarray(source)
+
+class DataLoader:
+    """Iterate a dataset in mini-batches of (X, y) arrays.
+
+    X and y may be arrays or paths to .npy files; paths are memory-mapped so
+    only the rows of the current batch are read into memory. Use
+    from_binary() for headerless binary files. With shuffle=True the order
+    is drawn from a generator seeded with `seed`, so every run sees the same
+    sequence of epochs. With prefetch > 0 the next batches are assembled on
+    a background thread while the current one is being trained on. Batches
+    are converted to `dtype`, by default engine.get_default_dtype().
+
+    Iterating yields batches for MLP.forward_batch(); samples() yields one
+    sample at a time as Values for MLP.__call__().
+    """
+    def __init__(self, X, y=None, batch_size=32, shuffle=False, seed=None,
+                 drop_last=False, prefetch=1, mmap=True, dtype=None):
+        self.X = _open(X, mmap)
+        self.y = _open(y, mmap)
+        if self.y is not None and len(self.y) != len(self.X):
+            raise ValueError(f"X has {len(self.X)} rows but y has {len(self.y)}")
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self.dtype = dtype
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_binary(cls, path, shape, dtype=np.float64, targets=None, target_shape=None, **kwargs):
+        """Memory-map a headerless binary file of `shape` rows (and optionally targets)"""
+        X = np.memmap(path, dtype=dtype, mode='r', shape=shape)
+        y = None
+        if targets is not None:
+            y = np.memmap(targets, dtype=dtype, mode='r', shape=target_shape or (shape[0],))
+        return cls(X, y, **kwargs)
+
+    def __len__(self):
+        n = len(self.X)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def _batch_indices(self):
+        n = len(self.X)
+        order = self._rng.permutation(n) if self.shuffle else None
+        for start in range(0, n, self.batch_size):
+            stop = min(start + self.batch_size, n)
+            if self.drop_last and stop - start < self.batch_size:
+                return
+            if order is None:
+                yield slice(start, stop)
+            else:
+                # Sorted rows keep reads from a memory map sequential
+                yield np.sort(order[start:stop])
+
+    def _load(self, index):
+        dtype = self.dtype or engine._default_dtype
+        X = np.array(self.X[index], dtype=dtype)
+        y = None if self.y is None else np.array(self.y[index], dtype=dtype)
+        return X, y
+
+    def __iter__(self):
+        batches = (self._load(index) for index in self._batch_indices())
+        if self.prefetch <= 0:
+            return batches
+        return _prefetch(batches, self.prefetch)
+
+    def samples(self):
+        """Yield ([Value, ...], target) pairs one sample at a time, in batch order"""
+        for X, y in self:
+            rows = X.tolist()
+            targets = [None] * len(rows) if y is None else y.tolist()
+            for row, target in zip(rows, targets):
+                yield [Value(v) for v in row], target
+
+_DONE = object()
+
+def _prefetch(iterator, depth):
+    """Run `iterator` on a background thread, keeping up to `depth` items ready"""
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up once the consumer has gone away instead of blocking forever
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as exc:
+            put(exc)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
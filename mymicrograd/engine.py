@@ -1,75 +1,225 @@
 import math
+import numbers
+import functools
+import threading
+
+# Operand types that Value ops wrap as constants; anything else is left to
+# the other operand's reflected method
+_NUMBERS = (int, float, numbers.Number)
+
+class _GradMode(threading.local):
+    # The class attribute is each thread's starting value
+    enabled = True
+
+# Graph construction switch, flipped by no_grad(). It is per thread, so
+# inference under no_grad() in one thread (e.g. a serving loop) does not
+# stop another thread's training from recording its graph.
+_grad_mode = _GradMode()
+
+def is_grad_enabled():
+    """Return True when operations on Values record a graph for backward() in this thread"""
+    return _grad_mode.enabled
+
+class no_grad:
+    """Context manager and decorator that turns off graph construction.
+
+    Inside it every op still computes its result, but the result has no
+    children and no backward rule, so nothing stays reachable from it and
+    inference memory does not grow with the number of predictions.
+    """
+    def __enter__(self):
+        self._prev_enabled = _grad_mode.enabled
+        _grad_mode.enabled = False
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _grad_mode.enabled = self._prev_enabled
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with no_grad():
+                return fn(*args, **kwargs)
+        return wrapper
+
+# Bumped whenever parameter values are updated (optimizer steps,
+# Module.load_state_dict), so caches of model outputs can tell in O(1)
+# that they are stale
+_parameter_version = 0
+
+def parameters_changed():
+    """Record that parameter values changed, so every InferenceCache drops its entries.
+
+    The optimizers and Module.load_state_dict call this; call it yourself
+    after editing parameter values by hand.
+    """
+    global _parameter_version
+    _parameter_version += 1
+
+# Floating dtype of array-backed storage (Tensor data, ParameterBuffer and
+# the optimizer state built from it, DataLoader batches); scalar Values
+# always hold Python floats
+_DTYPES = ('float64', 'float32')
+_default_dtype = 'float64'
+
+def set_default_dtype(dtype):
+    """Set the dtype new Tensors, ParameterBuffers and DataLoader batches use.
+
+    Accepts 'float32' or 'float64' (or the matching NumPy type) and returns
+    the previous setting, so it can be restored. float32 halves the memory
+    of parameters, gradients, activations and optimizer state.
+    """
+    global _default_dtype
+    name = getattr(dtype, '__name__', None) or getattr(dtype, 'name', None) or str(dtype)
+    if name not in _DTYPES:
+        raise ValueError(f"dtype must be one of {_DTYPES}, not {dtype!r}")
+    previous, _default_dtype = _default_dtype, name
+    return previous
+
+def get_default_dtype():
+    """Return the name of the dtype used for new array-backed storage"""
+    return _default_dtype
+
+def profile(**kwargs):
+    """Return a Profiler context manager that instruments the engine while active.
+
+    Profiling is opt-in and patches the engine only inside the `with`
+    block; see mymicrograd.profiler.Profiler for what it records.
+    """
+    from .profiler import Profiler
+    return Profiler(**kwargs)
+
 class Value:
+    # Nodes are created by the million, so they carry no __dict__. Children
+    # are a tuple, the backward rule is looked up from _op in _BACKWARD rather
+    # than stored as a closure per node, and _arg holds an op's extra operand.
+    __slots__ = ('data', 'grad', '_prev', '_op', '_arg', 'label')
+
     def __init__(self, data, _children=(),_op='',label=''):
         self.data = data
         self.grad = 0.0
-        self._backward = lambda: None
-        self._prev = set(_children)
-        self._op = _op
+        if _grad_mode.enabled:
+            self._prev = tuple(_children)
+            self._op = _op
+        else:
+            self._prev = ()
+            self._op = ''
+        self._arg = None
         self.label = label
 
-    def __add__(self,other):
-        other = other if isinstance(other,Value) else Value(other)
-        out = Value(self.data+other.data, (self,other), '+')
+    def _backward(self):
+        _BACKWARD[self._op](self)
+
+    # A plain number operand stays inside the node as _arg ('+c', '*c', 'c/')
+    # instead of becoming a leaf Value that would collect a useless gradient
 
-        def _backward():
-            self.grad += 1.0*out.grad
-            other.grad += 1.0*out.grad
-        out._backward = _backward
+    def __add__(self,other):
+        if isinstance(other,Value):
+            return Value(self.data+other.data, (self,other), '+')
+        if not isinstance(other,_NUMBERS):
+            return NotImplemented
+        out = Value(self.data+other, (self,), '+c')
+        out._arg = other
         return out
 
     def __mul__(self,other):
-        other = other if isinstance(other,Value) else Value(other)
-        out = Value(self.data*other.data, (self,other), '*')
+        if isinstance(other,Value):
+            return Value(self.data*other.data, (self,other), '*')
+        if not isinstance(other,_NUMBERS):
+            return NotImplemented
+        out = Value(self.data*other, (self,), '*c')
+        out._arg = other
+        return out
+
+    def __truediv__(self,other):
+        if isinstance(other,Value):
+            return Value(self.data/other.data, (self,other), '/')
+        if not isinstance(other,_NUMBERS):
+            return NotImplemented
+        return self * (1.0/other)
 
-        def _backward():
-            self.grad += other.data*out.grad
-            other.grad += self.data*out.grad
-        out._backward = _backward
+    def __rtruediv__(self,other):
+        if not isinstance(other,_NUMBERS):
+            return NotImplemented
+        out = Value(other/self.data, (self,), 'c/')
+        out._arg = other
         return out
     
     def __pow__(self,other):
         if not isinstance(other, (int,float)):
             raise TypeError(f'only int/float is supported not {type(other)}')
-        out = Value(self.data**other, (self,), f'**{other}')
-        def _backward():
-            self.grad += (other*(self.data**(other-1)))*out.grad
-        out._backward = _backward
+        out = Value(self.data**other, (self,), '**')
+        out._arg = other
         return out
 
-    def exp(self):
-        x = self.data
-        out = Value(math.exp(x),(self,),'exp')
+    @staticmethod
+    def dot(ws, xs, bias=None):
+        """Fused sum(w*x for w, x in zip(ws, xs)) + bias as a single node.
 
-        def _backward():
-            self.grad += out.data*out.grad
-        out._backward = _backward
+        The unfused expression builds two nodes per term and a chain as deep
+        as the inputs are long; here the whole weighted sum is one node whose
+        backward updates every operand directly.
+        """
+        ws = list(ws)
+        xs = list(xs)
+        if xs and not isinstance(xs[0], (Value,) + _NUMBERS):
+            # Inputs of another number type (e.g. forward.Dual) do the sum themselves
+            return type(xs[0]).dot(ws, xs, bias)
+        # Plain-number inputs are runtime data, not repeated literals, so
+        # they get their own Constant leaves rather than interned ones
+        xs = [x if isinstance(x, Value) else Constant(x) for x in xs]
+        n = min(len(ws), len(xs))
+        children = ws[:n] + xs[:n]
+        data = sum(w.data*x.data for w, x in zip(ws, xs))
+        if bias is not None:
+            bias = bias if isinstance(bias, Value) else Constant(bias)
+            children.append(bias)
+            data = data + bias.data
+        out = Value(data, children, 'dot')
+        out._arg = n
         return out
+
+    # Fused losses: the mean over all (prediction, target) pairs is one node
+    # whose backward is closed form, instead of a handful of nodes per pair
+
+    @staticmethod
+    def mse_loss(preds, targets):
+        """Mean of (pred - target)**2 as a single node"""
+        preds, targets, n = _loss_operands(preds, targets)
+        data = sum((p.data - t.data)**2 for p, t in zip(preds, targets)) / n
+        return _loss_node(data, preds, targets, 'mse')
+
+    @staticmethod
+    def bce_with_logits(logits, targets):
+        """Mean binary cross-entropy of sigmoid(logit) against 0/1 targets, as a single node.
+
+        Computed as softplus(z) - z*y with softplus(z) = log(1 + exp(z)) in
+        its log-sum-exp form, so it stays finite for logits of any size.
+        """
+        logits, targets, n = _loss_operands(logits, targets)
+        data = sum(_softplus(z.data) - z.data*y.data for z, y in zip(logits, targets)) / n
+        return _loss_node(data, logits, targets, 'bce')
+
+    @staticmethod
+    def hinge_loss(preds, targets):
+        """Mean of max(0, 1 - target*pred) for -1/+1 targets as a single node"""
+        preds, targets, n = _loss_operands(preds, targets)
+        data = sum(max(0.0, 1.0 - t.data*p.data) for p, t in zip(preds, targets)) / n
+        return _loss_node(data, preds, targets, 'hinge')
+
+    def exp(self):
+        x = self.data
+        return Value(math.exp(x),(self,),'exp')
     
     def tanh(self):
         x=self.data
         t=(math.exp(2*x)-1)/(math.exp(2*x)+1)
-        out=Value(t,(self,),'tanh')
-
-        def _backward():
-            self.grad += (1 - t**2)*out.grad
-        out._backward = _backward
-        return out
+        return Value(t,(self,),'tanh')
     
     def relu(self):
-        out = Value(0 if self.data<0 else self.data, (self,), 'ReLU')
-
-        def _backward():
-            self.grad += (out.data>0)*out.grad
-        out._backward = _backward
-        return out
+        return Value(0 if self.data<0 else self.data, (self,), 'ReLU')
 
-    def __trudiv__(self,other):
-        return self * other**-1
-    
-    def __rtruedev__(self,other):
-        return other * self**-1
-    
     def __rmul__(self,other):
         return self * other
     
@@ -88,17 +238,230 @@ class Value:
     def __repr__(self):
         return f"Value(data = {self.data}, grad = {self.grad})"
 
-    def backward(self):
-        topo=[]
-        visited=set()
-        def build_topo(v):
-            if v not in visited:
-                visited.add(v)
-                for child in v._prev:
-                    build_topo(child)
-                topo.append(v)
-        build_topo(self)
+    def detach(self):
+        """Return a new leaf Value holding this Value's data, with no history"""
+        return Value(self.data)
+
+    @staticmethod
+    def const(value):
+        """Return a shared Constant leaf for `value`.
+
+        Constants never accumulate a gradient, so one leaf per distinct
+        number can be reused by every graph; up to _MAX_CONSTANTS of them
+        are interned. Meant for literals written in code; wrap runtime data
+        (inputs, loss targets) in Constant() instead so it does not fill the
+        table.
+        """
+        # Keyed by type too, so const(True) and const(1.0) stay distinct
+        key = (type(value), value)
+        c = _CONSTANTS.get(key)
+        if c is None:
+            c = Constant(value)
+            if len(_CONSTANTS) < _MAX_CONSTANTS:
+                _CONSTANTS[key] = c
+        return c
+
+    def topo_order(self):
+        """Return every node reachable from this Value in topological order.
+
+        The graph is walked with an explicit stack rather than recursion, so
+        there is no depth limit. The list can be kept and passed back to
+        backward(retain_graph=True) to skip the sort on later calls over the
+        same graph.
+        """
+        return _topo_order(self)
+
+    def backward(self, topo=None, retain_graph=False):
+        """Accumulate d(self)/d(node) into every node's grad.
+
+        Unless retain_graph is True, each node's parent links and op are
+        dropped as soon as its backward rule has run, so the graph can be
+        freed even while the caller still holds this Value. Pass
+        retain_graph=True to backpropagate through the same graph again;
+        reaching a node freed by an earlier pass raises RuntimeError.
+        """
+        if topo is None:
+            topo = self.topo_order()
+        # A retained graph still holds the previous pass's interior grads
+        for node in topo:
+            if node._op:
+                if node._op == _FREED:
+                    _freed_backward(node)
+                node.grad = 0.0
 
         self.grad=1.0
+        backward_rules = _BACKWARD
+        if retain_graph:
+            for node in reversed(topo):
+                backward_rules[node._op](node)
+            return
         for node in reversed(topo):
-            node._backward()
\ No newline at end of file
+            if node._op:
+                backward_rules[node._op](node)
+                node._prev = ()
+                node._op = _FREED
+                node._arg = None
+
+def _topo_order(root):
+    # Iterative post-order DFS; shared by every node type with a _prev tuple
+    topo = []
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            topo.append(node)
+            continue
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.append((node, True))
+        for child in node._prev:
+            if child not in visited:
+                stack.append((child, False))
+    return topo
+
+class Constant(Value):
+    """A leaf Value whose gradient stays zero: writes to grad are dropped"""
+    __slots__ = ()
+
+    @property
+    def grad(self):
+        return 0.0
+
+    @grad.setter
+    def grad(self, value):
+        pass
+
+# Interned constants, keyed by (type, value), filled by Value.const()
+_CONSTANTS = {}
+_MAX_CONSTANTS = 4096
+
+def _loss_operands(preds, targets):
+    preds = list(preds)
+    # Targets are runtime data, so they get their own Constants, not interned ones
+    targets = [t if isinstance(t, Value) else Constant(t) for t in targets]
+    if len(preds) != len(targets) or not preds:
+        raise ValueError(f"need matching non-empty predictions and targets, got {len(preds)} and {len(targets)}")
+    return preds, targets, len(preds)
+
+def _loss_node(data, preds, targets, op):
+    # Children are all predictions followed by all targets; _arg is the count
+    out = Value(data, preds + targets, op)
+    out._arg = len(preds)
+    return out
+
+def _softplus(z):
+    return max(z, 0.0) + math.log1p(math.exp(-abs(z)))
+
+def _sigmoid(z):
+    return 0.5*(math.tanh(0.5*z) + 1.0)
+
+# Backward rules, keyed by the _op code of the node they propagate from
+
+# _op left on an interior node once backward() has released its graph
+_FREED = 'freed'
+
+def _freed_backward(out):
+    raise RuntimeError("graph already freed by backward(); pass retain_graph=True to backpropagate through it again")
+
+def _leaf_backward(out):
+    pass
+
+def _add_backward(out):
+    a, b = out._prev
+    a.grad += 1.0*out.grad
+    b.grad += 1.0*out.grad
+
+def _mul_backward(out):
+    a, b = out._prev
+    a.grad += b.data*out.grad
+    b.grad += a.data*out.grad
+
+def _add_const_backward(out):
+    a, = out._prev
+    a.grad += out.grad
+
+def _mul_const_backward(out):
+    a, = out._prev
+    a.grad += out._arg*out.grad
+
+def _div_backward(out):
+    a, b = out._prev
+    a.grad += out.grad/b.data
+    b.grad -= out.data/b.data*out.grad
+
+def _rdiv_const_backward(out):
+    a, = out._prev
+    a.grad -= out.data/a.data*out.grad
+
+def _dot_backward(out):
+    prev = out._prev
+    n = out._arg
+    g = out.grad
+    for w, x in zip(prev[:n], prev[n:2*n]):
+        w.grad += x.data*g
+        x.grad += w.data*g
+    if len(prev) > 2*n:
+        prev[2*n].grad += g
+
+def _pow_backward(out):
+    a, = out._prev
+    a.grad += (out._arg*(a.data**(out._arg-1)))*out.grad
+
+def _exp_backward(out):
+    a, = out._prev
+    a.grad += out.data*out.grad
+
+def _tanh_backward(out):
+    a, = out._prev
+    a.grad += (1 - out.data**2)*out.grad
+
+def _relu_backward(out):
+    a, = out._prev
+    a.grad += (out.data>0)*out.grad
+
+def _mse_backward(out):
+    prev = out._prev
+    n = out._arg
+    scale = 2.0*out.grad/n
+    for p, t in zip(prev[:n], prev[n:]):
+        d = (p.data - t.data)*scale
+        p.grad += d
+        t.grad -= d
+
+def _bce_backward(out):
+    prev = out._prev
+    n = out._arg
+    scale = out.grad/n
+    for z, y in zip(prev[:n], prev[n:]):
+        z.grad += (_sigmoid(z.data) - y.data)*scale
+        y.grad -= z.data*scale
+
+def _hinge_backward(out):
+    prev = out._prev
+    n = out._arg
+    scale = out.grad/n
+    for p, t in zip(prev[:n], prev[n:]):
+        if t.data*p.data < 1.0:
+            p.grad -= t.data*scale
+            t.grad -= p.data*scale
+
+_BACKWARD = {
+    '': _leaf_backward,
+    '+': _add_backward,
+    '*': _mul_backward,
+    '+c': _add_const_backward,
+    '*c': _mul_const_backward,
+    '/': _div_backward,
+    'c/': _rdiv_const_backward,
+    'dot': _dot_backward,
+    '**': _pow_backward,
+    'exp': _exp_backward,
+    'tanh': _tanh_backward,
+    'ReLU': _relu_backward,
+    'mse': _mse_backward,
+    'bce': _bce_backward,
+    'hinge': _hinge_backward,
+    _FREED: _freed_backward,
+}
@@ -0,0 +1,115 @@
+"""
+Forward-mode automatic differentiation with dual numbers
+"""
+import math
+from .engine import Value
+
+def _split(x):
+    """Return (primal, tangent) of a Dual, Value or plain number"""
+    if isinstance(x, Dual):
+        return x.primal, x.tangent
+    if isinstance(x, Value):
+        # Values (e.g. model parameters) enter forward mode as constants
+        return x.data, 0.0
+    return x, 0.0
+
+class Dual:
+    """A number carried together with its derivative along one direction.
+
+    Every op computes the primal value and the tangent (the directional
+    derivative) in the same step, so a forward pass over Duals yields a
+    Jacobian-vector product without building a graph: no parent links, no
+    backward rules, nothing kept once the result is returned. Duals mix
+    with plain numbers and with Values, which count as constants, so they
+    run through Neuron, Layer and MLP unchanged.
+    """
+    __slots__ = ('primal', 'tangent')
+
+    def __init__(self, primal, tangent=0.0):
+        self.primal = primal
+        self.tangent = tangent
+
+    def __add__(self, other):
+        p, t = _split(other)
+        return Dual(self.primal + p, self.tangent + t)
+
+    def __mul__(self, other):
+        p, t = _split(other)
+        return Dual(self.primal*p, self.tangent*p + self.primal*t)
+
+    def __pow__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError(f'only int/float is supported not {type(other)}')
+        return Dual(self.primal**other, other*(self.primal**(other-1))*self.tangent)
+
+    def __truediv__(self, other):
+        p, t = _split(other)
+        return Dual(self.primal/p, (self.tangent*p - self.primal*t)/(p*p))
+
+    def __rtruediv__(self, other):
+        p, t = _split(other)
+        return Dual(p/self.primal, (t*self.primal - p*self.tangent)/(self.primal*self.primal))
+
+    @staticmethod
+    def dot(ws, xs, bias=None):
+        """Fused sum(w*x for w, x in zip(ws, xs)) + bias, matching Value.dot"""
+        primal = 0.0
+        tangent = 0.0
+        for w, x in zip(ws, xs):
+            wp, wt = _split(w)
+            xp, xt = _split(x)
+            primal += wp*xp
+            tangent += wt*xp + wp*xt
+        if bias is not None:
+            bp, bt = _split(bias)
+            primal += bp
+            tangent += bt
+        return Dual(primal, tangent)
+
+    def exp(self):
+        e = math.exp(self.primal)
+        return Dual(e, e*self.tangent)
+
+    def tanh(self):
+        t = math.tanh(self.primal)
+        return Dual(t, (1 - t**2)*self.tangent)
+
+    def relu(self):
+        return Dual(0 if self.primal < 0 else self.primal, (self.primal > 0)*self.tangent)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __neg__(self):
+        return Dual(-self.primal, -self.tangent)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __repr__(self):
+        return f"Dual(primal = {self.primal}, tangent = {self.tangent})"
+
+def _unpack(out):
+    if isinstance(out, (list, tuple)):
+        primals, tangents = zip(*(_split(o) for o in out)) if out else ((), ())
+        return list(primals), list(tangents)
+    return _split(out)
+
+def jvp(fn, primals, tangents):
+    """Evaluate fn at `primals` and its derivative along `tangents` in one pass.
+
+    fn takes a list of inputs (like MLP.__call__) and returns a number or a
+    list of numbers. Returns (fn(primals), J @ tangents), each shaped like
+    fn's output, where J is the Jacobian of fn at `primals`.
+    """
+    primals = list(primals)
+    tangents = list(tangents)
+    if len(primals) != len(tangents):
+        raise ValueError(f"got {len(primals)} primals but {len(tangents)} tangents")
+    return _unpack(fn([Dual(p, t) for p, t in zip(primals, tangents)]))
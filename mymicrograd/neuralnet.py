@@ -1,15 +1,75 @@
 import random
-from .engine import Value
+from array import array
+from .engine import Value, parameters_changed
 
 class Module:
 
     def zero_grad(self):
+        buffer = getattr(self, '_buffer', None)
+        if buffer is not None and len(buffer):
+            buffer.zero_grad()
+            return
         for p in self.parameters():
             p.grad = 0
 
+    def flatten_parameters(self, dtype=None):
+        """Move every parameter into one contiguous ParameterBuffer and return it.
+
+        The parameters stay Values, but their data and grad become views
+        into the buffer's arrays, so optimizers can update them all at once.
+        `dtype` ('float32' or 'float64') sets this module's storage
+        precision, which optimizer state built on the buffer follows.
+        Calling it again returns the existing buffer, or rebuilds it when
+        a different `dtype` is asked for.
+        """
+        from .buffer import ParameterBuffer
+        buffer = getattr(self, '_buffer', None)
+        if buffer is not None and len(buffer):
+            if dtype is None or buffer.data.dtype == dtype:
+                return buffer
+            buffer.release()
+        self._buffer = ParameterBuffer(self.parameters(), dtype)
+        return self._buffer
+
     def parameters(self):
         return []
 
+    def state_dict(self):
+        """Return the parameter values, in parameters() order, as one flat float64 array"""
+        buffer = getattr(self, '_buffer', None)
+        if buffer is not None and len(buffer):
+            return {'parameters': array('d', buffer.data.astype('float64', copy=False).tobytes())}
+        values = array('d')
+        for p in self.parameters():
+            if hasattr(p.data, 'ravel'):
+                values.extend(p.data.ravel().tolist())
+            else:
+                values.append(p.data)
+        return {'parameters': values}
+
+    def load_state_dict(self, state):
+        """Copy parameter values from a state_dict() (or a loaded checkpoint) into the module"""
+        values = state['parameters']
+        parameters_changed()
+        buffer = getattr(self, '_buffer', None)
+        if buffer is not None and len(buffer):
+            if len(values) != len(buffer):
+                raise ValueError(f"state has {len(values)} parameter values, module has {len(buffer)}")
+            buffer.data[:] = values
+            return
+        params = self.parameters()
+        count = sum(p.data.size if hasattr(p.data, 'ravel') else 1 for p in params)
+        if len(values) != count:
+            raise ValueError(f"state has {len(values)} parameter values, module has {count}")
+        i = 0
+        for p in params:
+            if hasattr(p.data, 'ravel'):
+                p.data.flat[:] = values[i:i + p.data.size]
+                i += p.data.size
+            else:
+                p.data = values[i]
+                i += 1
+
 class Neuron(Module):
     def __init__(self,nin,nonlin=True):
         self.w = [Value(random.uniform(-1,1)) for _ in range(nin)]
@@ -17,7 +77,7 @@ class Neuron(Module):
         self.nonlin = nonlin
 
     def __call__(self,x):
-        act = sum(wi*xi for wi, xi in zip(self.w, x)) + self.b
+        act = Value.dot(self.w, x, self.b)
         return act.tanh() if self.nonlin else act
 
     def parameters(self):
@@ -29,11 +89,59 @@ class Neuron(Module):
 class Layer(Module):
     def __init__(self, nin, nout, **kwargs):
         self.neurons = [Neuron(nin, **kwargs) for _ in range(nout)]
+        self._span = None
 
     def __call__(self,x):
         outs = [n(x) for n in self.neurons]
         return outs[0] if len(outs)==1 else outs
 
+    def weight_matrix(self):
+        """Return the layer's weights as an (nin, nout) Tensor and its biases as (nout,).
+
+        On a flattened module these are views into the ParameterBuffer;
+        otherwise every call gathers all nin*nout parameters into new
+        arrays, so call flatten_parameters() before batched training.
+        """
+        from .tensor import Tensor
+        nin = len(self.neurons[0].w)
+        view = self._buffer_view()
+        if view is not None:
+            # Rows of the buffer block are [w..., b] per neuron
+            data, grad = view
+            return (Tensor.from_buffer(data[:, :nin].T, grad[:, :nin].T),
+                    Tensor.from_buffer(data[:, nin], grad[:, nin]))
+        W = Tensor.from_values((n.w[i] for i in range(nin) for n in self.neurons), (nin, len(self.neurons)))
+        b = Tensor.from_values((n.b for n in self.neurons), (len(self.neurons),))
+        return W, b
+
+    def _buffer_view(self):
+        """Return (nout, nin+1) data and grad views if the layer is contiguous in a ParameterBuffer"""
+        from .buffer import BufferedValue
+        b = self.neurons[0].b
+        if not isinstance(b, BufferedValue):
+            return None
+        buffer = b._arg[0]
+        # Contiguity is checked once per buffer, not on every batch
+        if self._span is None or self._span[0] is not buffer:
+            self._span = (buffer, buffer.span(self.parameters()))
+        start = self._span[1]
+        if start is None:
+            return None
+        shape = (len(self.neurons), len(self.neurons[0].w) + 1)
+        end = start + shape[0] * shape[1]
+        return buffer.data[start:end].reshape(shape), buffer.grad[start:end].reshape(shape)
+
+    def forward_batch(self,X):
+        """Run an (N, nin) batch through the layer in one pass, returning (N, nout).
+
+        Flatten the module first; see weight_matrix().
+        """
+        from .tensor import Tensor
+        X = X if isinstance(X, Tensor) else Tensor(X)
+        W, b = self.weight_matrix()
+        act = X @ W + b
+        return act.tanh() if self.neurons[0].nonlin else act
+
     def parameters(self):
         return [p for neuron in self.neurons for p in neuron.parameters()]
 
@@ -50,6 +158,16 @@ class MLP(Module):
             x = layer(x)
         return x
 
+    def forward_batch(self,X):
+        """Run an (N, nin) batch through the network in one pass, returning (N, nout).
+
+        Call flatten_parameters() first: unflattened layers gather every
+        parameter into fresh arrays on each call.
+        """
+        for layer in self.layers:
+            X = layer.forward_batch(X)
+        return X
+
     def parameters(self):
         return [p for layer in self.layers for p in layer.parameters()]
     
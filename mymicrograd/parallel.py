@@ -0,0 +1,95 @@
+"""
+Data-parallel training over a multiprocessing pool
+"""
+import multiprocessing
+from .engine import Value
+
+# Per-process state of a pool worker, set up once by _init_worker
+_worker = {}
+
+def _init_worker(model, loss_fn, shared_params, shared_grads, shared_losses):
+    _worker['model'] = model
+    _worker['loss_fn'] = loss_fn
+    _worker['params'] = model.parameters()
+    _worker['shared_params'] = shared_params
+    _worker['shared_grads'] = shared_grads
+    _worker['shared_losses'] = shared_losses
+
+def _worker_step(task):
+    """Run forward and backward over one shard and publish its gradient sum"""
+    worker_id, shard = task
+    model = _worker['model']
+    loss_fn = _worker['loss_fn']
+    params = _worker['params']
+    n = len(params)
+
+    for p, value in zip(params, _worker['shared_params']):
+        p.data = value
+        p.grad = 0.0
+
+    total = 0.0
+    for x, y in shard:
+        loss = loss_fn(model([Value(xi) for xi in x]), y)
+        loss.backward()
+        total += loss.data
+
+    _worker['shared_grads'][worker_id*n:(worker_id+1)*n] = [p.grad for p in params]
+    _worker['shared_losses'][worker_id] = total
+    return worker_id
+
+class DataParallelTrainer:
+    """Spread each training step's samples over a pool of model replicas.
+
+    Every worker process holds its own copy of the model. For each step the
+    current parameters are published in shared memory, each worker runs
+    forward and backward over its shard, and writes its gradient sum to its
+    row of a shared gradient buffer. The rows are added into the parameters'
+    `.grad` before `optimizer.step()`, so the update equals single-process
+    training on the summed per-sample losses, up to float summation order.
+    """
+    def __init__(self, model, loss_fn, optimizer, workers=None, start_method=None):
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        ctx = multiprocessing.get_context(start_method)
+        self.model = model
+        self.optimizer = optimizer
+        self.workers = workers or ctx.cpu_count() or 1
+        self.parameters = model.parameters()
+        n = len(self.parameters)
+        self._shared_params = ctx.RawArray('d', n)
+        self._shared_grads = ctx.RawArray('d', self.workers * n)
+        self._shared_losses = ctx.RawArray('d', self.workers)
+        self._pool = ctx.Pool(self.workers, initializer=_init_worker,
+                              initargs=(model, loss_fn, self._shared_params,
+                                        self._shared_grads, self._shared_losses))
+
+    def step(self, batch):
+        """Train on one batch of (x, y) samples and return the summed loss"""
+        batch = list(batch)
+        params = self.parameters
+        n = len(params)
+        self._shared_params[:] = [p.data for p in params]
+
+        size = -(-len(batch) // self.workers)
+        tasks = [(w, batch[w*size:(w+1)*size]) for w in range(self.workers)]
+        self._pool.map(_worker_step, tasks)
+
+        grads = self._shared_grads
+        self.optimizer.zero_grad()
+        for w in range(self.workers):
+            for p, g in zip(params, grads[w*n:(w+1)*n]):
+                p.grad += g
+        self.optimizer.step()
+        return sum(self._shared_losses)
+
+    def close(self):
+        """Shut the worker pool down"""
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,226 @@
+"""
+Opt-in profiler for the autograd engine and neural network modules
+"""
+import json
+import time
+from collections import defaultdict
+from . import engine
+from .engine import Value
+from . import neuralnet
+
+# Value methods that create a graph node themselves (derived operators such
+# as __sub__ or __radd__ go through these)
+_FORWARD_METHODS = ('__add__', '__mul__', '__truediv__', '__rtruediv__', '__pow__', 'exp', 'tanh',
+                    'relu', 'dot', 'mse_loss', 'bce_with_logits', 'hinge_loss')
+
+# Module methods timed for the per-layer breakdown
+_MODULE_METHODS = (
+    (neuralnet.Neuron, '__call__'),
+    (neuralnet.Layer, '__call__'),
+    (neuralnet.Layer, 'forward_batch'),
+    (neuralnet.MLP, '__call__'),
+    (neuralnet.MLP, 'forward_batch'),
+)
+
+_active = None
+
+class Profiler:
+    """Count and time what the engine does while the profiler is active.
+
+    Use it as a context manager (or through engine.profile()). While active
+    it records:
+      - nodes created per _op
+      - forward time per op and backward-rule time per op
+      - topological sort time, node count, graph depth and width
+      - calls, time and nodes created per Neuron/Layer/MLP, named by their
+        position in the enclosing MLP (e.g. 'layers.1.neurons.3')
+    Nothing is instrumented outside the `with` block: the profiler patches
+    the engine on entry and restores the original functions on exit, so a
+    disabled profiler costs nothing.
+    """
+    def __init__(self, trace=True):
+        self.trace = trace
+        self.nodes = defaultdict(int)
+        self.forward = defaultdict(lambda: [0, 0.0])
+        self.backward = defaultdict(lambda: [0, 0.0])
+        self.topo = []
+        self.modules = defaultdict(lambda: [0, 0.0, 0])
+        self.events = []
+        self._names = {}
+        self._patches = []
+        self._depth = 0
+        self._origin = 0.0
+
+    # Patching
+
+    def _patch(self, owner, name, value):
+        self._patches.append((owner, name, owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("a Profiler is already active")
+        _active = self
+        self._origin = time.perf_counter()
+
+        self._patch(Value, '__init__', self._wrap_init(Value.__init__))
+        for name in _FORWARD_METHODS:
+            original = Value.__dict__[name]
+            if isinstance(original, staticmethod):
+                self._patch(Value, name, staticmethod(self._wrap_forward(original.__func__, name)))
+            else:
+                self._patch(Value, name, self._wrap_forward(original, name))
+        for op, rule in list(engine._BACKWARD.items()):
+            engine._BACKWARD[op] = self._wrap_backward(rule, op)
+        self._patch(engine, '_topo_order', self._wrap_topo(engine._topo_order))
+        self._patch(Value, 'backward', self._wrap_event(Value.backward, 'backward'))
+        for cls, name in _MODULE_METHODS:
+            self._patch(cls, name, self._wrap_module(cls.__dict__[name], name))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+        for op, rule in list(engine._BACKWARD.items()):
+            engine._BACKWARD[op] = getattr(rule, '__wrapped__', rule)
+        _active = None
+        return False
+
+    # Wrappers
+
+    def _record(self, name, start, end, category):
+        if self.trace:
+            self.events.append({'name': name, 'cat': category, 'ph': 'X', 'pid': 0, 'tid': 0,
+                                'ts': (start - self._origin) * 1e6, 'dur': (end - start) * 1e6})
+
+    def _wrap_init(self, init):
+        nodes = self.nodes
+        def __init__(node, *args, **kwargs):
+            init(node, *args, **kwargs)
+            nodes[node._op or 'leaf'] += 1
+        return __init__
+
+    def _wrap_forward(self, fn, name):
+        profiler = self
+        forward = self.forward
+        def wrapper(*args, **kwargs):
+            # Only the outermost op is timed, so nested calls are not double counted
+            if profiler._depth:
+                return fn(*args, **kwargs)
+            profiler._depth += 1
+            start = time.perf_counter()
+            try:
+                out = fn(*args, **kwargs)
+            finally:
+                profiler._depth -= 1
+            elapsed = time.perf_counter() - start
+            entry = forward[out._op if isinstance(out, Value) and out._op else name]
+            entry[0] += 1
+            entry[1] += elapsed
+            return out
+        wrapper.__name__ = name
+        return wrapper
+
+    def _wrap_backward(self, rule, op):
+        backward = self.backward
+        def wrapper(out):
+            start = time.perf_counter()
+            rule(out)
+            entry = backward[op or 'leaf']
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+        wrapper.__wrapped__ = rule
+        return wrapper
+
+    def _wrap_topo(self, topo_order):
+        profiler = self
+        def _topo_order(root):
+            start = time.perf_counter()
+            topo = topo_order(root)
+            end = time.perf_counter()
+            depth, width = graph_shape(topo)
+            profiler.topo.append({'seconds': end - start, 'nodes': len(topo), 'depth': depth, 'width': width})
+            profiler._record('topo_sort', start, end, 'engine')
+            return topo
+        return _topo_order
+
+    def _wrap_event(self, fn, name):
+        profiler = self
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler._record(name, start, time.perf_counter(), 'engine')
+        return wrapper
+
+    def _wrap_module(self, fn, method):
+        profiler = self
+        def wrapper(module, *args, **kwargs):
+            profiler._name_children(module)
+            name = profiler._names.get(id(module), type(module).__name__)
+            if method != '__call__':
+                name = f"{name}.{method}"
+            created = sum(profiler.nodes.values())
+            start = time.perf_counter()
+            try:
+                return fn(module, *args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                entry = profiler.modules[name]
+                entry[0] += 1
+                entry[1] += end - start
+                entry[2] += sum(profiler.nodes.values()) - created
+                profiler._record(name, start, end, 'module')
+        return wrapper
+
+    def _name_children(self, module):
+        """Name an MLP's layers and a Layer's neurons after their position"""
+        prefix = self._names.get(id(module))
+        if isinstance(module, neuralnet.MLP):
+            prefix = prefix or 'MLP'
+            self._names.setdefault(id(module), prefix)
+            for i, layer in enumerate(module.layers):
+                self._names.setdefault(id(layer), f"{prefix}.layers.{i}")
+        elif isinstance(module, neuralnet.Layer):
+            prefix = prefix or 'Layer'
+            for j, neuron in enumerate(module.neurons):
+                self._names.setdefault(id(neuron), f"{prefix}.neurons.{j}")
+
+    # Reporting
+
+    def report(self):
+        """Return the collected statistics as a printable table"""
+        lines = ['op           nodes   fwd calls   fwd ms   bwd calls   bwd ms']
+        ops = sorted(set(self.nodes) | set(self.forward) | set(self.backward))
+        for op in ops:
+            fwd = self.forward.get(op, (0, 0.0))
+            bwd = self.backward.get(op, (0, 0.0))
+            lines.append(f"{op:<10} {self.nodes.get(op, 0):>7} {fwd[0]:>11} {fwd[1] * 1e3:8.2f} {bwd[0]:>11} {bwd[1] * 1e3:8.2f}")
+        for i, sort in enumerate(self.topo):
+            lines.append(f"topo sort {i}: {sort['seconds'] * 1e3:.2f} ms, {sort['nodes']} nodes, "
+                         f"depth {sort['depth']}, width {sort['width']}")
+        if self.modules:
+            lines.append('module                                calls       ms    nodes')
+            for name, (calls, seconds, nodes) in sorted(self.modules.items(), key=lambda item: -item[1][1]):
+                lines.append(f"{name:<36} {calls:>7} {seconds * 1e3:8.2f} {nodes:>8}")
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path):
+        """Write the recorded events as a Chrome trace (chrome://tracing, Perfetto)"""
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+def graph_shape(topo):
+    """Return (depth, width) of a graph: its longest leaf-to-root path in
+    edges and the largest number of nodes at one depth"""
+    level = {}
+    for node in topo:
+        level[node] = 1 + max((level[c] for c in node._prev), default=-1)
+    counts = defaultdict(int)
+    for value in level.values():
+        counts[value] += 1
+    return (max(level.values(), default=0), max(counts.values(), default=0))
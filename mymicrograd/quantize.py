@@ -0,0 +1,155 @@
+"""
+Int8 post-training quantization of MLP weights for inference
+"""
+import numpy as np
+from .engine import no_grad
+from .neuralnet import Neuron, Layer, MLP
+from .sparse import SparseLayer
+from .serialization import save, load
+
+FORMAT = 'mymicrograd-int8-mlp'
+
+def _dense(layer):
+    """Return (weights (nout, nin), biases (nout,), nonlin) for a Layer, SparseLayer or Neuron"""
+    if isinstance(layer, SparseLayer):
+        # Pruned connections become zero weights, which quantize exactly
+        nout = len(layer.biases)
+        rows = np.repeat(np.arange(nout), np.diff(np.asarray(layer.indptr)))
+        weights = np.zeros((nout, layer.nin))
+        weights[rows, np.asarray(layer.indices)] = [w.data for w in layer.weights]
+        return weights, np.array([b.data for b in layer.biases], dtype=np.float64), layer.nonlin
+    neurons = layer.neurons if isinstance(layer, Layer) else [layer]
+    return (np.array([[w.data for w in n.w] for n in neurons], dtype=np.float64),
+            np.array([n.b.data for n in neurons], dtype=np.float64),
+            neurons[0].nonlin)
+
+def _layers(model):
+    """Return [(weights (nout, nin), biases (nout,), nonlin)] for an MLP, Layer, SparseLayer or Neuron"""
+    layers = model.layers if isinstance(model, MLP) else [model]
+    for layer in layers:
+        if not isinstance(layer, (Layer, SparseLayer, Neuron)):
+            raise TypeError(f"cannot quantize {type(layer).__name__}")
+    return [_dense(layer) for layer in layers]
+
+def _scales(weights, per):
+    """Symmetric scales mapping each neuron's (or the layer's) largest |w| to 127"""
+    if per == 'neuron':
+        peak = np.abs(weights).max(axis=1)
+    elif per == 'layer':
+        peak = np.full(len(weights), np.abs(weights).max())
+    else:
+        raise ValueError(f"per must be 'neuron' or 'layer', not {per!r}")
+    return np.where(peak > 0, peak / 127.0, 1.0)
+
+class QuantizedMLP:
+    """Inference-only network with int8 weights and float32 scales and biases.
+
+    The int8 weights are the storage format: save() writes one int8 per
+    weight, a quarter of a float32 file and an eighth of a float64 one. In
+    memory each layer keeps its integer weight levels as a pre-transposed
+    (nin, nout) float32 kernel, half the bytes of the float64 model, so the
+    forward pass is a float32 BLAS matmul. It quantizes each sample's
+    activations to int8 levels with their own scale, multiplies them by
+    the kernel and rescales by the per-neuron (or per-layer) weight
+    scales; no Value or Tensor is ever created.
+    """
+    def __init__(self, layers):
+        # layers: [(int8 weights (nout, nin), float scales (nout,), float biases (nout,), nonlin)]
+        # Integer products are at most 127*127, so the float32 sums are the
+        # exact int32 accumulation for layers of up to 1040 inputs; beyond
+        # that rounding is far below the quantization error
+        self.layers = [(np.asarray(q, dtype=np.int8).T.astype(np.float32), np.asarray(s, dtype=np.float32),
+                        np.asarray(b, dtype=np.float32), bool(nonlin)) for q, s, b, nonlin in layers]
+
+    def __call__(self, X):
+        """Run an (N, nin) batch, or a single input vector, and return float32 outputs"""
+        X = np.asarray(X, dtype=np.float32)
+        single = X.ndim == 1
+        if single:
+            X = X[None, :]
+        for kernel, scales, biases, nonlin in self.layers:
+            peak = np.abs(X).max(axis=1, keepdims=True)
+            sx = np.where(peak > 0, peak / np.float32(127.0), np.float32(1.0))
+            X = (np.rint(X / sx) @ kernel) * (sx * scales) + biases
+            if nonlin:
+                X = np.tanh(X)
+        return X[0] if single else X
+
+    def weights(self):
+        """Return each layer's (nout, nin) int8 weights"""
+        return [kernel.T.astype(np.int8) for kernel, _, _, _ in self.layers]
+
+    def nbytes(self):
+        """Bytes held in memory by the kernels, scales and biases"""
+        return sum(k.nbytes + s.nbytes + b.nbytes for k, s, b, _ in self.layers)
+
+    def storage_nbytes(self):
+        """Bytes of the int8 weights, scales and biases that save() writes"""
+        return sum(k.size + s.nbytes + b.nbytes for k, s, b, _ in self.layers)
+
+    def save(self, path):
+        """Write the network to a standalone checkpoint file"""
+        state = {'format': FORMAT, 'layers': {}}
+        for i, (q, (_, s, b, nonlin)) in enumerate(zip(self.weights(), self.layers)):
+            state['layers'][str(i)] = {'weights': q, 'scales': s, 'biases': b, 'nonlin': nonlin,
+                                       'nin': q.shape[1], 'nout': q.shape[0]}
+        save(state, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a network written by save(); builds no autograd objects"""
+        state = load(path)
+        if state.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a quantized MLP")
+        layers = []
+        for i in range(len(state['layers'])):
+            layer = state['layers'][str(i)]
+            q = np.frombuffer(layer['weights'], dtype=np.int8).reshape(layer['nout'], layer['nin'])
+            layers.append((q, np.frombuffer(layer['scales'], dtype=np.float32),
+                           np.frombuffer(layer['biases'], dtype=np.float32), layer['nonlin']))
+        return cls(layers)
+
+def quantize(model, per='neuron'):
+    """Quantize an MLP, Layer or Neuron to a QuantizedMLP with per-'neuron' or per-'layer' scales"""
+    layers = []
+    for weights, biases, nonlin in _layers(model):
+        scales = _scales(weights, per)
+        q = np.clip(np.rint(weights / scales[:, None]), -127, 127).astype(np.int8)
+        layers.append((q, scales, biases, nonlin))
+    return QuantizedMLP(layers)
+
+def compare(model, quantized, X, y=None):
+    """Measure how far the quantized network's outputs are from the float model's.
+
+    Returns the max and mean absolute output difference on X, the fraction
+    of outputs whose sign agrees, the float parameter bytes against the
+    quantized network's in-memory and saved (int8) bytes, and with targets
+    y the mean squared error of each model.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    with no_grad():
+        if isinstance(model, Neuron):
+            reference = np.array([[model(row).data] for row in X.tolist()])
+        else:
+            reference = model.forward_batch(X).data
+    got = quantized(X).reshape(reference.shape)
+    diff = np.abs(got - reference)
+    report = {
+        'max_abs_diff': float(diff.max()),
+        'mean_abs_diff': float(diff.mean()),
+        'sign_agreement': float(np.mean(np.sign(got) == np.sign(reference))),
+        'float_bytes': len(model.parameters()) * 8,
+        'quantized_bytes': quantized.nbytes(),
+        'quantized_storage_bytes': quantized.storage_nbytes(),
+    }
+    if y is not None:
+        y = np.asarray(y, dtype=np.float64).reshape(reference.shape)
+        report['float_mse'] = float(np.mean((reference - y) ** 2))
+        report['quantized_mse'] = float(np.mean((got - y) ** 2))
+    return report
+
+def export(model, path, X, y=None, per='neuron'):
+    """Quantize `model`, write it to `path` and return the compare() report on X (and y)"""
+    quantized = quantize(model, per)
+    quantized.save(path)
+    return compare(model, quantized, X, y)
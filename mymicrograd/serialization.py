@@ -0,0 +1,119 @@
+"""
+Compact binary checkpoints for module and optimizer state
+"""
+import json
+import mmap as _mmap
+import struct
+import sys
+from array import array
+
+# File layout: magic, little-endian u64 header length, JSON header, padding
+# to 8 bytes, then each array's raw little-endian values at its offset.
+MAGIC = b'MMGRAD01'
+_ALIGN = 8
+_TYPECODES = ('d', 'f', 'b')
+
+def _flatten_state(state, prefix=''):
+    for key, value in state.items():
+        name = f"{prefix}{key}"
+        if '.' in str(key):
+            raise ValueError(f"state keys must not contain '.': {key!r}")
+        if isinstance(value, dict):
+            yield from _flatten_state(value, name + '.')
+        else:
+            yield name, value
+
+def _to_array(value):
+    """Return (typecode, raw little-endian bytes) for an array-like value"""
+    dtype = getattr(value, 'dtype', None)
+    if dtype is not None:
+        if dtype.kind == 'i' and dtype.itemsize == 1:
+            typecode = 'b'
+        else:
+            typecode = 'f' if dtype.itemsize == 4 and dtype.kind == 'f' else 'd'
+        return typecode, value.astype('<' + typecode, copy=False).tobytes()
+    if isinstance(value, memoryview):
+        typecode = value.format if value.format in _TYPECODES else 'd'
+        values = array(typecode, value)
+    elif isinstance(value, array) and value.typecode in _TYPECODES:
+        values = array(value.typecode, value)
+    else:
+        values = array('d', value)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.typecode, values.tobytes()
+
+def save(state, path):
+    """Write a (possibly nested) state dict to `path`.
+
+    Sequences of numbers (lists, array.array, memoryviews, NumPy arrays) are
+    stored as raw float64, float32 or int8 blocks; everything else must be a
+    JSON scalar and goes into the header. Floats round-trip bit-exact.
+    """
+    entries = {}
+    meta = {}
+    blocks = []
+    offset = 0
+    for name, value in _flatten_state(state):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            meta[name] = value
+            continue
+        typecode, raw = _to_array(value)
+        entries[name] = {'dtype': typecode, 'offset': offset, 'count': len(raw) // array(typecode).itemsize}
+        blocks.append(raw)
+        offset += -(-len(raw) // _ALIGN) * _ALIGN
+
+    header = json.dumps({'entries': entries, 'meta': meta}).encode('utf-8')
+    start = len(MAGIC) + 8 + len(header)
+    header += b' ' * (-start % _ALIGN)
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for raw in blocks:
+            f.write(raw)
+            f.write(b'\0' * (-len(raw) % _ALIGN))
+
+def load(path, mmap=True):
+    """Read a state dict written by save().
+
+    With mmap=True (the default, on little-endian machines) arrays come back
+    as read-only memoryviews straight over the mapped file, so loading costs
+    the same however large the checkpoint is; otherwise they are
+    array.array copies.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a mymicrograd checkpoint")
+        (length,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(length).decode('utf-8'))
+        data_start = len(MAGIC) + 8 + length
+        if mmap and sys.byteorder == 'little':
+            buf = memoryview(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ))
+        else:
+            f.seek(0)
+            buf = memoryview(f.read())
+            mmap = False
+
+    flat = dict(header['meta'])
+    for name, entry in header['entries'].items():
+        typecode = entry['dtype']
+        start = data_start + entry['offset']
+        raw = buf[start:start + entry['count'] * array(typecode).itemsize]
+        if mmap:
+            flat[name] = raw.cast(typecode)
+        else:
+            values = array(typecode)
+            values.frombytes(raw)
+            if sys.byteorder != 'little':
+                values.byteswap()
+            flat[name] = values
+
+    state = {}
+    for name, value in flat.items():
+        *parents, key = name.split('.')
+        node = state
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return state
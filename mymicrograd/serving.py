@@ -0,0 +1,183 @@
+"""
+Asyncio inference server that answers concurrent requests in micro-batches
+"""
+import asyncio
+import json
+import time
+from collections import deque
+import numpy as np
+from . import engine
+from .engine import no_grad
+
+def _percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def _fail_closed(items):
+    """Fail the futures of queued (input, future, start) requests because the server closed"""
+    for _, future, _ in items:
+        if not future.done():
+            future.set_exception(RuntimeError("server closed"))
+
+class InferenceServer:
+    """Serve predictions of a model with forward_batch() (Layer, MLP) to many callers.
+
+    Concurrent predict() calls are queued and gathered into one batch until
+    `max_batch_size` requests are waiting or the oldest has waited
+    `max_delay` seconds; the batch then runs through a single vectorized
+    forward pass under no_grad(), so no graph is built per request.
+
+    serve() also exposes the server on a TCP port speaking newline-delimited
+    JSON: each line is one input vector and is answered by one line holding
+    the prediction (a number, or a list for multi-output models). The line
+    "stats" is answered with stats().
+
+    Use it as an async context manager, or call start() and close().
+    """
+    def __init__(self, model, max_batch_size=32, max_delay=0.002, history=10000):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.requests = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=history)
+        self._queue = None
+        self._worker = None
+        self._server = None
+        self._started = None
+
+    async def start(self):
+        """Start the batching loop on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._batch_loop())
+        self._started = time.perf_counter()
+        return self
+
+    async def close(self):
+        """Stop listening and stop the batching loop, failing requests still waiting"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            waiting = []
+            while not self._queue.empty():
+                waiting.append(self._queue.get_nowait())
+            _fail_closed(waiting)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def predict(self, x):
+        """Return the model's prediction for one input vector"""
+        if self._worker is None:
+            raise RuntimeError("InferenceServer is not started")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((x, future, time.perf_counter()))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_delay
+                while len(batch) < self.max_batch_size:
+                    # Take whatever is already queued before waiting for more
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                self._run(batch)
+        except asyncio.CancelledError:
+            # close() cancelled us while this batch was still being gathered
+            _fail_closed(batch)
+            raise
+
+    def _forward(self, inputs):
+        X = np.array(inputs, dtype=engine._default_dtype)
+        with no_grad():
+            Y = self.model.forward_batch(X).data
+        return Y[:, 0].tolist() if Y.shape[1] == 1 else Y.tolist()
+
+    def _run(self, batch):
+        try:
+            rows = self._forward([x for x, _, _ in batch])
+        except Exception as exc:
+            if len(batch) > 1:
+                # Retry one by one so a malformed request fails on its own
+                for item in batch:
+                    self._run([item])
+                return
+            future = batch[0][1]
+            if not future.done():
+                future.set_exception(exc)
+            return
+        now = time.perf_counter()
+        for (_, future, start), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+            self.latencies.append(now - start)
+        self.requests += len(batch)
+        self.batches += 1
+
+    def stats(self):
+        """Return request and batch counters, throughput and p50/p99 latency in ms"""
+        latencies = sorted(self.latencies)
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'throughput_per_s': self.requests / elapsed if elapsed else 0.0,
+            'p50_ms': _percentile(latencies, 50) * 1e3,
+            'p99_ms': _percentile(latencies, 99) * 1e3,
+        }
+
+    async def serve(self, host='127.0.0.1', port=0):
+        """Listen on host:port (port 0 picks a free one) and return the bound port"""
+        if self._worker is None:
+            await self.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line == b'stats':
+                    reply = self.stats()
+                else:
+                    try:
+                        reply = await self.predict(json.loads(line))
+                    except Exception as exc:
+                        reply = {'error': f"{type(exc).__name__}: {exc}"}
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
@@ -0,0 +1,152 @@
+"""
+Magnitude pruning and a sparse Layer that stores only the kept connections
+"""
+from array import array
+from operator import itemgetter
+from .engine import Value
+from .neuralnet import Module, Layer
+
+def _gather(columns):
+    """Return a function picking `columns` out of an input list as a tuple"""
+    if not columns:
+        return lambda x: ()
+    if len(columns) == 1:
+        column = columns[0]
+        return lambda x: (x[column],)
+    return itemgetter(*columns)
+
+class SparseLayer(Module):
+    """A Layer whose weight matrix is kept in compressed sparse row (CSR) form.
+
+    Output neuron r uses the weights weights[indptr[r]:indptr[r+1]], which
+    connect to the inputs listed at the same positions of `indices`. Only
+    these nonzero weights exist as Values, so memory and the work done by
+    forward and backward (one fused dot per output) scale with the number of
+    kept connections rather than with nin * nout. parameters() lists each
+    row's weights followed by its bias, like Layer.
+    """
+    def __init__(self, nin, indptr, indices, weights, biases, nonlin=True):
+        if len(indptr) != len(biases) + 1 or indptr[-1] != len(indices) or len(indices) != len(weights):
+            raise ValueError("indptr, indices, weights and biases do not describe the same CSR matrix")
+        self.nin = nin
+        self.indptr = array('i', indptr)
+        self.indices = array('i', indices)
+        self.biases = [b if isinstance(b, Value) else Value(b) for b in biases]
+        self.nonlin = nonlin
+        weights = [w if isinstance(w, Value) else Value(w) for w in weights]
+        # Per output: (its weights, a gather of its input columns, its bias)
+        self._rows = [(weights[start:stop], _gather(self.indices[start:stop]), b)
+                      for start, stop, b in zip(self.indptr, self.indptr[1:], self.biases)]
+        # NumPy index arrays for forward_batch, built on first use
+        self._dense = None
+        self._positions = None
+
+    @classmethod
+    def from_layer(cls, layer, sparsity=0.0):
+        """Build a SparseLayer from a dense Layer, dropping its `sparsity` fraction of smallest |w|"""
+        nin = len(layer.neurons[0].w)
+        ranked = sorted((abs(w.data), r, j) for r, n in enumerate(layer.neurons) for j, w in enumerate(n.w))
+        dropped = {(r, j) for _, r, j in ranked[:int(round(sparsity * len(ranked)))]}
+        indptr, indices, weights = [0], [], []
+        for r, n in enumerate(layer.neurons):
+            for j, w in enumerate(n.w):
+                if (r, j) not in dropped:
+                    indices.append(j)
+                    weights.append(w.data)
+            indptr.append(len(indices))
+        return cls(nin, indptr, indices, weights, [n.b.data for n in layer.neurons], layer.neurons[0].nonlin)
+
+    @property
+    def weights(self):
+        """The stored weights in CSR order, matching `indices`"""
+        return [w for ws, _, _ in self._rows for w in ws]
+
+    @property
+    def nnz(self):
+        """Number of stored (nonzero) weights"""
+        return len(self.indices)
+
+    @property
+    def density(self):
+        """Fraction of the dense nin * nout weights that are stored"""
+        return self.nnz / (self.nin * len(self.biases))
+
+    def __call__(self, x):
+        outs = []
+        for ws, gather, b in self._rows:
+            act = Value.dot(ws, gather(x), b)
+            outs.append(act.tanh() if self.nonlin else act)
+        return outs[0] if len(outs) == 1 else outs
+
+    def _dense_index(self):
+        """Flat positions of the stored weights in the dense (nin, nout) weight matrix"""
+        if self._dense is None:
+            import numpy as np
+            nout = len(self.biases)
+            rows = np.repeat(np.arange(nout), np.diff(np.asarray(self.indptr)))
+            self._dense = np.asarray(self.indices) * nout + rows
+        return self._dense
+
+    def _buffer_positions(self):
+        """Return (buffer, weight positions, bias positions) if every parameter is in one ParameterBuffer"""
+        from .buffer import BufferedValue
+        b = self.biases[0]
+        if not isinstance(b, BufferedValue):
+            return None
+        buffer = b._arg[0]
+        # Positions are looked up once per buffer
+        if self._positions is None or self._positions[0] is not buffer:
+            import numpy as np
+            params = self.parameters()
+            if all(isinstance(p, BufferedValue) and p._arg[0] is buffer for p in params):
+                self._positions = (buffer, np.array([w._arg[1] for w in self.weights], dtype=np.intp),
+                                   np.array([b._arg[1] for b in self.biases], dtype=np.intp))
+            else:
+                self._positions = (buffer, None, None)
+        return self._positions if self._positions[1] is not None else None
+
+    def _weight_tensors(self):
+        """Return the stored weights as an (nnz,) Tensor and the biases as (nout,)"""
+        from .tensor import Tensor
+        positions = self._buffer_positions()
+        if positions is not None:
+            buffer, wpos, bpos = positions
+            return (Tensor.take(buffer.data, buffer.grad, wpos),
+                    Tensor.take(buffer.data, buffer.grad, bpos))
+        return (Tensor.from_values(self.weights, (self.nnz,)),
+                Tensor.from_values(self.biases, (len(self.biases),)))
+
+    def forward_batch(self, X):
+        """Run an (N, nin) batch through the layer in one pass, returning (N, nout).
+
+        The stored weights are scattered into a dense (nin, nout) matrix, so
+        the product is one BLAS matmul; backward sends the gradient of the
+        stored entries only back to the stored weights.
+        """
+        from .tensor import Tensor
+        X = X if isinstance(X, Tensor) else Tensor(X)
+        ws, b = self._weight_tensors()
+        W = ws.scatter(self._dense_index(), (self.nin, len(self.biases)))
+        act = X @ W + b
+        return act.tanh() if self.nonlin else act
+
+    def parameters(self):
+        return [p for ws, _, b in self._rows for p in ws + [b]]
+
+    def __repr__(self):
+        return f"SparseLayer({self.nin}, {len(self.biases)}, nnz={self.nnz})"
+
+def prune(model, sparsity):
+    """Replace every dense Layer of an MLP by a SparseLayer keeping its largest weights.
+
+    `sparsity` is the fraction of each layer's weights to remove (0.9 keeps
+    the 10% largest by magnitude). The model is changed in place and
+    returned; build optimizers from model.parameters() after pruning.
+    """
+    if not 0.0 <= sparsity < 1.0:
+        raise ValueError(f"sparsity must be in [0, 1), not {sparsity}")
+    model.layers = [SparseLayer.from_layer(layer, sparsity) if isinstance(layer, Layer) else layer
+                    for layer in model.layers]
+    # A flat buffer built before pruning no longer holds the parameters
+    model._buffer = None
+    return model
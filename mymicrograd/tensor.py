@@ -0,0 +1,338 @@
+"""
+NumPy-backed autograd tensor: one graph node holds a whole ndarray
+"""
+import numpy as np
+from . import engine
+from .engine import _topo_order, _FREED, _freed_backward
+
+class Tensor:
+    # Same node layout and backward dispatch as Value, but data and grad
+    # are ndarrays, so a matmul over a whole layer is a single node. Like
+    # Value.grad (and what zero_grad() writes), grad starts as the scalar 0.0
+    # and becomes an ndarray once something is accumulated into it.
+    __slots__ = ('data', 'grad', '_prev', '_op', '_arg', 'label')
+
+    # Make ndarray <op> Tensor defer to Tensor's reflected operators
+    __array_ufunc__ = None
+
+    def __init__(self, data, _children=(), _op='', label='', dtype=None):
+        if dtype is None:
+            # Floating arrays keep their precision; anything else is converted
+            # to the default dtype (see engine.set_default_dtype)
+            kind = getattr(getattr(data, 'dtype', None), 'kind', None)
+            dtype = data.dtype if kind == 'f' else engine._default_dtype
+        self.data = np.asarray(data, dtype=dtype)
+        self.grad = 0.0
+        if engine._grad_mode.enabled:
+            self._prev = tuple(_children)
+            self._op = _op
+        else:
+            self._prev = ()
+            self._op = ''
+        self._arg = None
+        self.label = label
+
+    @classmethod
+    def from_values(cls, values, shape):
+        """Gather scalar Values into one Tensor node of the given shape.
+
+        Backward scatters the Tensor's gradient into each Value's grad, so a
+        batched pass over Value parameters still leaves one gradient per
+        parameter for Module.parameters() and the optimizers.
+        """
+        values = list(values)
+        data = np.fromiter((v.data for v in values), dtype=engine._default_dtype, count=len(values))
+        out = cls(data.reshape(shape), (), 'gather')
+        out._arg = values
+        return out
+
+    @classmethod
+    def from_buffer(cls, data, grad):
+        """Wrap views into a ParameterBuffer's arrays as one Tensor node.
+
+        Backward adds the Tensor's gradient straight into the `grad` view, so
+        the buffered parameters see it without any per-element scatter.
+        """
+        out = cls(data, (), 'view')
+        out._arg = grad
+        return out
+
+    @classmethod
+    def take(cls, data, grad, index):
+        """Pick the entries at `index` (distinct positions) of a ParameterBuffer's arrays as one node.
+
+        Like from_buffer, but for parameters that are not contiguous in the
+        buffer; backward adds the gradient into grad[index].
+        """
+        out = cls(data[index], (), 'take')
+        out._arg = (grad, index)
+        return out
+
+    def scatter(self, index, shape):
+        """Place this 1-D tensor's entries at the flat positions `index` of a zero array of `shape`"""
+        data = np.zeros(int(np.prod(shape)), dtype=self.data.dtype)
+        data[index] = self.data
+        out = Tensor(data.reshape(shape), (self,), 'scatter')
+        out._arg = index
+        return out
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def _backward(self):
+        _TENSOR_BACKWARD[self._op](self)
+
+    def __add__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other, dtype=self.data.dtype)
+        return Tensor(self.data + other.data, (self, other), '+')
+
+    def __mul__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other, dtype=self.data.dtype)
+        return Tensor(self.data * other.data, (self, other), '*')
+
+    def __matmul__(self, other):
+        other = other if isinstance(other, Tensor) else Tensor(other, dtype=self.data.dtype)
+        if self.data.ndim > 2 or other.data.ndim > 2:
+            raise ValueError('matmul supports only 1-D and 2-D tensors')
+        return Tensor(self.data @ other.data, (self, other), '@')
+
+    def __rmatmul__(self, other):
+        return Tensor(other, dtype=self.data.dtype) @ self
+
+    def __pow__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError(f'only int/float is supported not {type(other)}')
+        out = Tensor(self.data ** other, (self,), '**')
+        out._arg = other
+        return out
+
+    def exp(self):
+        return Tensor(np.exp(self.data), (self,), 'exp')
+
+    def tanh(self):
+        return Tensor(np.tanh(self.data), (self,), 'tanh')
+
+    def relu(self):
+        return Tensor(np.maximum(self.data, 0.0), (self,), 'ReLU')
+
+    def sum(self, axis=None, keepdims=False):
+        out = Tensor(self.data.sum(axis=axis, keepdims=keepdims), (self,), 'sum')
+        out._arg = (axis, keepdims)
+        return out
+
+    def mean(self, axis=None, keepdims=False):
+        out = Tensor(self.data.mean(axis=axis, keepdims=keepdims), (self,), 'mean')
+        out._arg = (axis, keepdims)
+        return out
+
+    # Fused losses over every element, matching Value.mse_loss and friends;
+    # each is one node whose target may be a Tensor or any array of equal size
+
+    def mse_loss(self, target):
+        target = _loss_target(self, target)
+        diff = self.data - target.data.reshape(self.data.shape)
+        return Tensor(np.mean(diff**2), (self, target), 'mse')
+
+    def bce_with_logits(self, target):
+        target = _loss_target(self, target)
+        z = self.data
+        y = target.data.reshape(z.shape)
+        return Tensor(np.mean(np.logaddexp(0.0, z) - z*y), (self, target), 'bce')
+
+    def hinge_loss(self, target):
+        target = _loss_target(self, target)
+        margin = 1.0 - target.data.reshape(self.data.shape)*self.data
+        return Tensor(np.mean(np.maximum(margin, 0.0)), (self, target), 'hinge')
+
+    def __truediv__(self, other):
+        return self * other**-1
+
+    def __rtruediv__(self, other):
+        return other * self**-1
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return other + (-self)
+
+    def __repr__(self):
+        return f"Tensor(data = {self.data}, grad = {self.grad})"
+
+    def detach(self):
+        """Return a new leaf Tensor sharing this Tensor's data, with no history"""
+        return Tensor(self.data)
+
+    def topo_order(self):
+        """Return every node reachable from this Tensor in topological order"""
+        return _topo_order(self)
+
+    def backward(self, topo=None, retain_graph=False):
+        """Accumulate gradients like Value.backward, with the same retain_graph semantics"""
+        if topo is None:
+            topo = self.topo_order()
+        for node in topo:
+            if node._op:
+                if node._op == _FREED:
+                    _freed_backward(node)
+                node.grad = 0.0
+
+        self.grad = np.ones_like(self.data)
+        backward_rules = _TENSOR_BACKWARD
+        if retain_graph:
+            for node in reversed(topo):
+                backward_rules[node._op](node)
+            return
+        for node in reversed(topo):
+            if node._op:
+                backward_rules[node._op](node)
+                node._prev = ()
+                node._op = _FREED
+                node._arg = None
+
+def _unbroadcast(grad, shape):
+    """Sum a broadcast gradient back down to the operand's shape"""
+    if grad.shape == shape:
+        return grad
+    grad = grad.sum(axis=tuple(range(grad.ndim - len(shape))))
+    axes = tuple(i for i, n in enumerate(shape) if n == 1 and grad.shape[i] != 1)
+    return grad.sum(axis=axes, keepdims=True) if axes else grad
+
+def _expand_reduced(grad, shape, axis, keepdims):
+    """Broadcast the gradient of a sum/mean back over the reduced axes"""
+    if axis is not None and not keepdims:
+        grad = np.expand_dims(grad, axis)
+    return np.broadcast_to(grad, shape)
+
+def _loss_target(pred, target):
+    target = target if isinstance(target, Tensor) else Tensor(target, dtype=pred.data.dtype)
+    if target.data.size != pred.data.size or not pred.data.size:
+        raise ValueError(f"need matching non-empty predictions and targets, got shapes {pred.shape} and {target.shape}")
+    return target
+
+# Backward rules, keyed by the _op code of the node they propagate from
+
+def _leaf_backward(out):
+    pass
+
+def _gather_backward(out):
+    for v, g in zip(out._arg, out.grad.ravel().tolist()):
+        v.grad += g
+
+def _view_backward(out):
+    out._arg += out.grad
+
+def _take_backward(out):
+    grad, index = out._arg
+    grad[index] += out.grad
+
+def _scatter_backward(out):
+    a, = out._prev
+    a.grad += out.grad.ravel()[out._arg]
+
+def _add_backward(out):
+    a, b = out._prev
+    a.grad += _unbroadcast(out.grad, a.data.shape)
+    b.grad += _unbroadcast(out.grad, b.data.shape)
+
+def _mul_backward(out):
+    a, b = out._prev
+    a.grad += _unbroadcast(b.data * out.grad, a.data.shape)
+    b.grad += _unbroadcast(a.data * out.grad, b.data.shape)
+
+def _matmul_backward(out):
+    a, b = out._prev
+    g = out.grad
+    if a.data.ndim == 1 and b.data.ndim == 1:
+        a.grad += g * b.data
+        b.grad += g * a.data
+    elif a.data.ndim == 1:
+        a.grad += b.data @ g
+        b.grad += np.outer(a.data, g)
+    elif b.data.ndim == 1:
+        a.grad += np.outer(g, b.data)
+        b.grad += a.data.T @ g
+    else:
+        a.grad += g @ b.data.T
+        b.grad += a.data.T @ g
+
+def _pow_backward(out):
+    a, = out._prev
+    a.grad += (out._arg * a.data ** (out._arg - 1)) * out.grad
+
+def _exp_backward(out):
+    a, = out._prev
+    a.grad += out.data * out.grad
+
+def _tanh_backward(out):
+    a, = out._prev
+    a.grad += (1 - out.data ** 2) * out.grad
+
+def _relu_backward(out):
+    a, = out._prev
+    a.grad += (out.data > 0) * out.grad
+
+def _sum_backward(out):
+    a, = out._prev
+    axis, keepdims = out._arg
+    a.grad += _expand_reduced(out.grad, a.data.shape, axis, keepdims)
+
+def _mean_backward(out):
+    a, = out._prev
+    axis, keepdims = out._arg
+    count = a.data.size // max(out.data.size, 1)
+    a.grad += _expand_reduced(out.grad, a.data.shape, axis, keepdims) / count
+
+def _loss_backward(out, pred_grad, target_grad):
+    p, t = out._prev
+    p.grad += pred_grad
+    t.grad += target_grad.reshape(t.data.shape)
+
+def _mse_backward(out):
+    p, t = out._prev
+    d = (p.data - t.data.reshape(p.data.shape)) * (2.0 * out.grad / p.data.size)
+    _loss_backward(out, d, -d)
+
+def _bce_backward(out):
+    z, y = out._prev
+    scale = out.grad / z.data.size
+    sigmoid = 0.5 * (np.tanh(0.5 * z.data) + 1.0)
+    _loss_backward(out, (sigmoid - y.data.reshape(z.data.shape)) * scale, -z.data * scale)
+
+def _hinge_backward(out):
+    p, t = out._prev
+    scale = out.grad / p.data.size
+    y = t.data.reshape(p.data.shape)
+    active = y * p.data < 1.0
+    _loss_backward(out, -(active * y) * scale, -(active * p.data) * scale)
+
+_TENSOR_BACKWARD = {
+    '': _leaf_backward,
+    'gather': _gather_backward,
+    'view': _view_backward,
+    'take': _take_backward,
+    'scatter': _scatter_backward,
+    '+': _add_backward,
+    '*': _mul_backward,
+    '@': _matmul_backward,
+    '**': _pow_backward,
+    'exp': _exp_backward,
+    'tanh': _tanh_backward,
+    'ReLU': _relu_backward,
+    'sum': _sum_backward,
+    'mean': _mean_backward,
+    'mse': _mse_backward,
+    'bce': _bce_backward,
+    'hinge': _hinge_backward,
+    _FREED: _freed_backward,
+}
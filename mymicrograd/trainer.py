@@ -0,0 +1,50 @@
+"""
+Training steps that backpropagate sample by sample instead of through one big graph
+"""
+from .engine import Value
+
+def accumulate_grad(losses):
+    """Backpropagate each loss as it is produced and return their summed value.
+
+    Gradients add into `.grad` exactly as they would from summing every loss
+    into one Value and calling backward() once, but each loss's graph is
+    released straight after its own backward, so at most one of them is
+    alive at a time. Pass a generator to keep peak memory at one graph.
+    """
+    total = 0.0
+    for loss in losses:
+        loss.backward()
+        total += loss.data
+    return total
+
+class Trainer:
+    """Run optimizer steps with gradients accumulated over micro-batches.
+
+    Each step backpropagates `loss_fn(model(x), y)` summed over
+    `micro_batch` samples at a time and throws that graph away before
+    building the next, so peak memory is one micro-batch graph rather than
+    the whole batch, and the update equals training on the summed loss.
+    """
+    def __init__(self, model, loss_fn, optimizer, micro_batch=1):
+        if micro_batch < 1:
+            raise ValueError(f"micro_batch must be at least 1, not {micro_batch}")
+        self.model = model
+        self.loss_fn = loss_fn
+        self.optimizer = optimizer
+        self.micro_batch = micro_batch
+
+    def _losses(self, batch):
+        for start in range(0, len(batch), self.micro_batch):
+            loss = None
+            for x, y in batch[start:start + self.micro_batch]:
+                sample = self.loss_fn(self.model([Value(xi) for xi in x]), y)
+                loss = sample if loss is None else loss + sample
+            yield loss
+
+    def step(self, batch):
+        """Train on one batch of (x, y) samples and return the summed loss"""
+        batch = list(batch)
+        self.optimizer.zero_grad()
+        total = accumulate_grad(self._losses(batch))
+        self.optimizer.step()
+        return total
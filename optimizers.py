@@ -1,15 +1,28 @@
 """
 Optimizers for the mini neural network framework
 """
-from mymicrograd.engine import Value
+from array import array
+from mymicrograd.engine import Value, parameters_changed
+
+try:
+    from mymicrograd.buffer import find_buffer
+except ImportError:  # NumPy is optional; without it there are no buffers
+    def find_buffer(parameters):
+        return None
 
 class Optimizer:
     """Base optimizer class"""
     def __init__(self, parameters):
         self.parameters = list(parameters)
+        # Parameters flattened with Module.flatten_parameters() are updated
+        # as whole arrays instead of one Value at a time
+        self.buffer = find_buffer(self.parameters)
     
     def zero_grad(self):
         """Zero out gradients of all parameters"""
+        if self.buffer is not None:
+            self.buffer.zero_grad()
+            return
         for param in self.parameters:
             param.grad = 0.0
     
@@ -17,14 +30,44 @@ class Optimizer:
         """Update parameters - to be implemented by subclasses"""
         raise NotImplementedError
 
+    def state_dict(self):
+        """Return hyperparameters and per-parameter state for checkpointing"""
+        return {}
+
+    def load_state_dict(self, state):
+        """Restore what state_dict() returned (or a loaded checkpoint)"""
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def _dump_slots(self, values):
+        """Copy per-parameter state out as a flat float array"""
+        return values.copy() if self.buffer is not None else array('d', values)
+
+    def _load_slots(self, values):
+        """Copy per-parameter state into this optimizer's storage type"""
+        if len(values) != len(self.parameters):
+            raise ValueError(f"state has {len(values)} entries, optimizer has {len(self.parameters)} parameters")
+        if self.buffer is not None:
+            slots = self.buffer.zeros()
+            slots[:] = values
+            return slots
+        return list(values)
+
 class SGD(Optimizer):
     """Stochastic Gradient Descent optimizer"""
     def __init__(self, parameters, lr=0.01):
         super().__init__(parameters)
         self.lr = lr
     
+    def state_dict(self):
+        return {'lr': self.lr}
+
     def step(self):
         """Update parameters using SGD"""
+        parameters_changed()
+        if self.buffer is not None:
+            self.buffer.data -= self.lr * self.buffer.grad
+            return
         for param in self.parameters:
             param.data -= self.lr * param.grad
 
@@ -34,10 +77,27 @@ class SGDMomentum(Optimizer):
         super().__init__(parameters)
         self.lr = lr
         self.momentum = momentum
-        self.velocities = [0.0 for _ in self.parameters]
+        if self.buffer is not None:
+            self.velocities = self.buffer.zeros()
+        else:
+            self.velocities = [0.0 for _ in self.parameters]
     
+    def state_dict(self):
+        return {'lr': self.lr, 'momentum': self.momentum, 'velocities': self._dump_slots(self.velocities)}
+
+    def load_state_dict(self, state):
+        state = dict(state)
+        self.velocities = self._load_slots(state.pop('velocities'))
+        super().load_state_dict(state)
+
     def step(self):
         """Update parameters using SGD with momentum"""
+        parameters_changed()
+        if self.buffer is not None:
+            self.velocities *= self.momentum
+            self.velocities += self.lr * self.buffer.grad
+            self.buffer.data -= self.velocities
+            return
         for i, param in enumerate(self.parameters):
             self.velocities[i] = self.momentum * self.velocities[i] + self.lr * param.grad
             param.data -= self.velocities[i]
@@ -50,13 +110,37 @@ class Adam(Optimizer):
         self.beta1 = beta1
         self.beta2 = beta2
         self.eps = eps
-        self.m = [0.0 for _ in self.parameters]  # First moment
-        self.v = [0.0 for _ in self.parameters]  # Second moment
+        if self.buffer is not None:
+            self.m = self.buffer.zeros()  # First moment
+            self.v = self.buffer.zeros()  # Second moment
+        else:
+            self.m = [0.0 for _ in self.parameters]  # First moment
+            self.v = [0.0 for _ in self.parameters]  # Second moment
         self.t = 0  # Time step
     
+    def state_dict(self):
+        return {'lr': self.lr, 'beta1': self.beta1, 'beta2': self.beta2, 'eps': self.eps,
+                't': self.t, 'm': self._dump_slots(self.m), 'v': self._dump_slots(self.v)}
+
+    def load_state_dict(self, state):
+        state = dict(state)
+        self.m = self._load_slots(state.pop('m'))
+        self.v = self._load_slots(state.pop('v'))
+        super().load_state_dict(state)
+
     def step(self):
         """Update parameters using Adam"""
+        parameters_changed()
         self.t += 1
+
+        if self.buffer is not None:
+            grad = self.buffer.grad
+            self.m = self.beta1 * self.m + (1 - self.beta1) * grad
+            self.v = self.beta2 * self.v + (1 - self.beta2) * (grad ** 2)
+            m_hat = self.m / (1 - self.beta1 ** self.t)
+            v_hat = self.v / (1 - self.beta2 ** self.t)
+            self.buffer.data -= self.lr * m_hat / (v_hat ** 0.5 + self.eps)
+            return
         
         for i, param in enumerate(self.parameters):
             # Update biased first moment estimate
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for the mini neural network framework
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks import suite
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default: all of {', '.join(suite.BENCHMARKS)})")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes and fewer repeats")
+    parser.add_argument('--output', default='bench_results.json', help="where to write the results JSON")
+    parser.add_argument('--compare', metavar='PREVIOUS', help="results JSON of a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(suite.BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = suite.run(args.names, quick=args.quick)
+    for metric, value in results.items():
+        print(f"{metric:<48} {value:14.6g}")
+
+    report = {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if not args.compare:
+        return True
+    with open(args.compare) as f:
+        previous = json.load(f)['results']
+    rows = suite.compare(results, previous, args.threshold)
+    print(f"\n{'metric':<48} {'previous':>12} {'current':>12} {'change':>8}")
+    for metric, old, new, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{metric:<48} {old:12.4g} {new:12.4g} {change:+7.1%}{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    return regressions == 0
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
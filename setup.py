@@ -35,6 +35,9 @@ setup(
         # No external dependencies - pure Python!
     ],
     extras_require={
+        "numpy": [
+            "numpy>=1.17",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-cov",
@@ -0,0 +1,125 @@
+import unittest
+import copy
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    from mymicrograd.buffer import ParameterBuffer, BufferedValue, find_buffer
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from optimizers import SGD, SGDMomentum, Adam
+
+dataset = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+
+def train(mlp, optimizer, epochs=5):
+    for _ in range(epochs):
+        total = Value(0.0)
+        for x, y in dataset:
+            total = total + (mlp([Value(xi) for xi in x]) - y) ** 2
+        optimizer.zero_grad()
+        total.backward()
+        optimizer.step()
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestParameterBuffer(unittest.TestCase):
+
+    def test_values_view_buffer(self):
+        """Test that flattened parameters read and write the shared arrays"""
+        mlp = MLP(2, [3, 1])
+        before = [p.data for p in mlp.parameters()]
+        buffer = mlp.flatten_parameters()
+
+        params = mlp.parameters()
+        self.assertEqual(len(buffer), len(params))
+        self.assertEqual([p.data for p in params], before)
+        self.assertIsInstance(params[0], BufferedValue)
+        self.assertIsInstance(params[0], Value)
+        self.assertIs(find_buffer(params), buffer)
+        self.assertIsNone(find_buffer(params[1:]))
+
+        buffer.data[0] = 42.0
+        self.assertEqual(params[0].data, 42.0)
+        self.assertIs(type(params[0].data), float)
+        params[1].grad += 2.5
+        self.assertEqual(buffer.grad[1], 2.5)
+        self.assertIs(type(params[1].grad), float)
+        # In-place optimizer updates are seen through the Values
+        buffer.data -= 2.0
+        self.assertEqual(params[0].data, 40.0)
+
+        mlp.zero_grad()
+        self.assertFalse(buffer.grad.any())
+
+    def test_optimizers_match_unflattened(self):
+        """Test that vectorized optimizer steps match the per-parameter loop"""
+        for make_optimizer in (lambda ps: SGD(ps, lr=0.1),
+                               lambda ps: SGDMomentum(ps, lr=0.1, momentum=0.9),
+                               lambda ps: Adam(ps, lr=0.05)):
+            reference = MLP(2, [4, 1])
+            flat = copy.deepcopy(reference)
+            flat.flatten_parameters()
+
+            train(reference, make_optimizer(reference.parameters()))
+            optimizer = make_optimizer(flat.parameters())
+            self.assertIsNotNone(optimizer.buffer)
+            train(flat, optimizer)
+
+            for p, q in zip(flat.parameters(), reference.parameters()):
+                self.assertAlmostEqual(p.data, q.data, places=12)
+
+    def test_forward_batch_uses_views(self):
+        """Test that the batched pass writes gradients straight into the buffer"""
+        reference = MLP(2, [4, 1])
+        flat = copy.deepcopy(reference)
+        buffer = flat.flatten_parameters()
+        X = np.array([x for x, _ in dataset])
+
+        W, b = flat.layers[0].weight_matrix()
+        self.assertEqual(W._op, 'view')
+        self.assertTrue(np.shares_memory(W.data, buffer.data))
+        # Later batches reuse the span found for this buffer
+        buffer.span = None
+        self.assertTrue(np.shares_memory(flat.layers[0].weight_matrix()[0].data, buffer.data))
+        del buffer.span
+
+        for mlp in (reference, flat):
+            mlp.zero_grad()
+            (mlp.forward_batch(X) ** 2).sum().backward()
+        for p, q in zip(flat.parameters(), reference.parameters()):
+            self.assertAlmostEqual(p.grad, q.grad, places=12)
+
+    def test_flatten_twice(self):
+        """Test that flattening again reuses the buffer unless the dtype changes"""
+        mlp = MLP(2, [3, 1])
+        buffer = mlp.flatten_parameters()
+        self.assertIs(mlp.flatten_parameters(), buffer)
+        self.assertIs(mlp.flatten_parameters(dtype='float64'), buffer)
+
+        single = mlp.flatten_parameters(dtype='float32')
+        self.assertIsNot(single, buffer)
+        self.assertEqual(single.data.dtype, np.float32)
+        self.assertEqual(len(buffer), 0)
+        self.assertIs(find_buffer(mlp.parameters()), single)
+        W, b = mlp.layers[0].weight_matrix()
+        self.assertTrue(np.shares_memory(W.data, single.data))
+
+    def test_release(self):
+        """Test that released parameters become standalone Values again"""
+        mlp = MLP(2, [2, 1])
+        buffer = mlp.flatten_parameters()
+        buffer.data += 1.0
+        expected = buffer.data.tolist()
+        buffer.release()
+
+        params = mlp.parameters()
+        self.assertTrue(all(type(p) is Value for p in params))
+        self.assertEqual([p.data for p in params], expected)
+        mlp.zero_grad()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,155 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value, profile, parameters_changed
+from mymicrograd.neuralnet import MLP
+from mymicrograd.cache import InferenceCache
+from optimizers import SGD
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Untouchable(Value):
+    """A parameter that fails the test if anything reads its value"""
+    __slots__ = ()
+
+    @property
+    def data(self):
+        raise AssertionError("parameter read on a cache hit")
+
+class TestInferenceCache(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(4)
+        self.mlp = MLP(3, [4, 1])
+        self.x = [0.2, -0.5, 0.9]
+
+    def test_hit_matches_model(self):
+        """Test that a repeated input is answered from the cache with the model's output"""
+        cache = InferenceCache(self.mlp)
+        expected = self.mlp([Value(v) for v in self.x]).data
+        self.assertEqual(cache(self.x).data, expected)
+        xs = [Value(v) for v in self.x]
+        with profile() as prof:
+            self.assertEqual(cache(xs).data, expected)
+        # A hit builds only the returned leaf
+        self.assertEqual(dict(prof.nodes), {'leaf': 1})
+
+        # ... and reads no parameter
+        params = self.mlp.parameters()
+        for p in params:
+            p.__class__ = Untouchable
+        try:
+            self.assertEqual(cache(self.x).data, expected)
+        finally:
+            for p in params:
+                p.__class__ = Value
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 1, 1))
+
+    def test_multiple_outputs(self):
+        """Test that multi-output models get a list of Values back"""
+        mlp = MLP(3, [4, 2])
+        cache = InferenceCache(mlp)
+        expected = [o.data for o in mlp([Value(v) for v in self.x])]
+        for _ in range(2):
+            self.assertEqual([o.data for o in cache(self.x)], expected)
+
+    def test_rounding(self):
+        """Test that inputs equal after rounding share one entry computed on the rounded vector"""
+        cache = InferenceCache(self.mlp, decimals=2)
+        a = cache([0.201, -0.5, 0.9]).data
+        b = cache([0.199, -0.5, 0.9]).data
+        self.assertEqual(a, b)
+        self.assertEqual(a, self.mlp([Value(v) for v in self.x]).data)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is dropped once maxsize is exceeded"""
+        cache = InferenceCache(self.mlp, maxsize=2)
+        cache([0.0, 0.0, 1.0])
+        cache([0.0, 1.0, 0.0])
+        cache([0.0, 0.0, 1.0])  # now the most recently used
+        cache([1.0, 0.0, 0.0])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache([0.0, 0.0, 1.0])
+        self.assertEqual(cache.stats()['hits'], 2)
+        cache([0.0, 1.0, 0.0])
+        self.assertEqual(cache.stats()['misses'], 4)
+
+    def test_ttl(self):
+        """Test that entries older than ttl are recomputed"""
+        clock = FakeClock()
+        cache = InferenceCache(self.mlp, ttl=10.0, clock=clock)
+        cache(self.x)
+        clock.now = 9.0
+        cache(self.x)
+        clock.now = 10.5
+        cache(self.x)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expirations']), (1, 2, 1))
+
+    def test_invalidated_by_optimizer_step(self):
+        """Test that optimizer steps, load_state_dict and parameters_changed() drop stale predictions"""
+        flat = (False, True) if np is not None else (False,)
+        for flatten in flat:
+            mlp = MLP(3, [4, 1])
+            if flatten:
+                mlp.flatten_parameters()
+            cache = InferenceCache(mlp)
+            before = cache(self.x).data
+            optimizer = SGD(mlp.parameters(), lr=0.1)
+            loss = (mlp([Value(v) for v in self.x]) - 1.0) ** 2
+            optimizer.zero_grad()
+            loss.backward()
+            # Gradients alone do not change predictions
+            self.assertEqual(cache(self.x).data, before)
+            optimizer.step()
+            after = cache(self.x).data
+            self.assertNotEqual(after, before)
+            self.assertEqual(after, mlp([Value(v) for v in self.x]).data)
+
+            mlp.load_state_dict(MLP(3, [4, 1]).state_dict())
+            self.assertEqual(cache(self.x).data, mlp([Value(v) for v in self.x]).data)
+
+            mlp.parameters()[-1].data += 1.0
+            parameters_changed()
+            self.assertEqual(cache(self.x).data, mlp([Value(v) for v in self.x]).data)
+            self.assertEqual(cache.stats()['invalidations'], 3)
+
+    def test_snapshot_catches_manual_edits(self):
+        """Test that snapshot=True notices parameters edited without parameters_changed()"""
+        flat = (False, True) if np is not None else (False,)
+        for flatten in flat:
+            mlp = MLP(3, [4, 1])
+            if flatten:
+                mlp.flatten_parameters()
+            cache = InferenceCache(mlp, snapshot=True)
+            before = cache(self.x).data
+            self.assertEqual(cache(self.x).data, before)
+            mlp.parameters()[-1].data += 1.0
+            after = cache(self.x).data
+            self.assertEqual(after, mlp([Value(v) for v in self.x]).data)
+            self.assertNotEqual(after, before)
+            self.assertEqual(cache.stats()['invalidations'], 1)
+
+    def test_rejects_bad_size(self):
+        """Test that the cache must hold at least one entry"""
+        with self.assertRaises(ValueError):
+            InferenceCache(self.mlp, maxsize=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value, no_grad
+from mymicrograd.neuralnet import MLP
+from mymicrograd.checkpoint import checkpoint, checkpoint_sequential
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(6)
+        self.mlp = MLP(3, [4, 4, 4, 4, 2])
+        self.x = [0.2, -0.5, 0.9]
+
+    def reference(self):
+        self.mlp.zero_grad()
+        xs = [Value(v) for v in self.x]
+        a, b = self.mlp(xs)
+        loss = a * a + b * 3.0
+        loss.backward()
+        return loss.data, [p.grad for p in self.mlp.parameters()], [v.grad for v in xs]
+
+    def test_matches_plain_backward(self):
+        """Test that every segment count gives the un-checkpointed gradients"""
+        expected_loss, expected_grads, expected_input_grads = self.reference()
+        for segments in (1, 2, 3, 5):
+            self.mlp.zero_grad()
+            xs = [Value(v) for v in self.x]
+            a, b = checkpoint_sequential(self.mlp.layers, xs, segments)
+            loss = a * a + b * 3.0
+            loss.backward()
+            self.assertAlmostEqual(loss.data, expected_loss, places=12)
+            for p, g in zip(self.mlp.parameters(), expected_grads):
+                self.assertAlmostEqual(p.grad, g, places=12)
+            for v, g in zip(xs, expected_input_grads):
+                self.assertAlmostEqual(v.grad, g, places=12)
+
+    def test_stores_only_boundaries(self):
+        """Test that the forward graph holds only segment boundary nodes"""
+        out = checkpoint_sequential(self.mlp.layers, [Value(v) for v in self.x], 2)
+        ops = [node._op for node in out[0].topo_order()]
+        self.assertEqual(set(ops), {'', 'checkpoint', 'unpack'})
+        self.assertEqual(ops.count('checkpoint'), 2)
+
+    def test_retain_graph(self):
+        """Test that a retained checkpointed graph gives the same gradients twice"""
+        out = checkpoint(lambda xs: self.mlp(xs)[0], self.x)
+        self.mlp.zero_grad()
+        out.backward(retain_graph=True)
+        first = [p.grad for p in self.mlp.parameters()]
+        self.mlp.zero_grad()
+        out.backward()
+        for p, g in zip(self.mlp.parameters(), first):
+            self.assertAlmostEqual(p.grad, g, places=12)
+
+    def test_no_grad_runs_plainly(self):
+        """Test that checkpointing under no_grad just runs the layers"""
+        with no_grad():
+            out = checkpoint_sequential(self.mlp.layers, self.x, 2)
+        self.assertEqual(out[0]._prev, ())
+
+    def test_invalid_segments(self):
+        """Test that the segment count must fit the number of layers"""
+        with self.assertRaises(ValueError):
+            checkpoint_sequential(self.mlp.layers, self.x, 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import mymicrograd
+from mymicrograd import codegen
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from losses import MSELoss
+
+mse = MSELoss()
+
+def loss_fn(pred, y):
+    return mse([pred], [y])
+
+dataset = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+
+def eager_grads(mlp, x, y):
+    mlp.zero_grad()
+    loss = loss_fn(mlp([Value(xi) for xi in x]), y)
+    loss.backward()
+    return loss.data, [p.grad for p in mlp.parameters()]
+
+class TestCodegen(unittest.TestCase):
+
+    def test_python_backend_matches_eager(self):
+        """Test that generated Python code gives the eager loss and gradients"""
+        mlp = MLP(2, [4, 1])
+        compiled = mymicrograd.compile(mlp, loss_fn, backend='python')
+        for x, y in dataset:
+            expected_loss, expected_grads = eager_grads(mlp, x, y)
+            mlp.zero_grad()
+            self.assertAlmostEqual(compiled(x, y), expected_loss, places=12)
+            for p, g in zip(mlp.parameters(), expected_grads):
+                self.assertAlmostEqual(p.grad, g, places=12)
+
+    def test_generated_source_is_straight_line(self):
+        """Test that the generated source has no op dispatch or calls into Value"""
+        mlp = MLP(2, [3, 1])
+        compiled = mymicrograd.compile(mlp, loss_fn)
+        tape = compiled.trace(*dataset[1])
+        source = codegen.generate_source(tape)
+        self.assertNotIn('Value', source)
+        self.assertNotIn('if ', source)
+        self.assertNotIn('for ', source)
+
+    def test_wide_layer(self):
+        """Test that a layer with thousands of inputs compiles and matches eager"""
+        import random
+        mlp = MLP(4000, [2, 1])
+        x = [random.uniform(-1, 1) for _ in range(4000)]
+        expected_loss, expected_grads = eager_grads(mlp, x, 0.5)
+        compiled = mymicrograd.compile(mlp, loss_fn, backend='python')
+        mlp.zero_grad()
+        self.assertAlmostEqual(compiled(x, 0.5), expected_loss, places=12)
+        for p, g in zip(mlp.parameters(), expected_grads):
+            self.assertAlmostEqual(p.grad, g, places=12)
+
+    def test_cached_by_signature(self):
+        """Test that models of the same shape reuse one generated function"""
+        codegen.clear_cache()
+        first = mymicrograd.compile(MLP(2, [4, 1]), loss_fn, backend='python')
+        second = mymicrograd.compile(MLP(2, [4, 1]), loss_fn, backend='python')
+        other = mymicrograd.compile(MLP(2, [5, 1]), loss_fn, backend='python')
+        for compiled in (first, second, other):
+            compiled(*dataset[0])
+        self.assertIs(first._fn, second._fn)
+        self.assertIsNot(first._fn, other._fn)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_backend_sums_batch(self):
+        """Test that the NumPy backend gives the summed per-sample results"""
+        mlp = MLP(2, [4, 1])
+        expected_loss = 0.0
+        expected_grads = [0.0] * len(mlp.parameters())
+        for x, y in dataset:
+            loss, grads = eager_grads(mlp, x, y)
+            expected_loss += loss
+            expected_grads = [a + b for a, b in zip(expected_grads, grads)]
+
+        compiled = mymicrograd.compile(mlp, loss_fn, backend='numpy')
+        X = np.array([x for x, _ in dataset])
+        Y = np.array([y for _, y in dataset])
+        mlp.zero_grad()
+        self.assertAlmostEqual(compiled(X, Y), expected_loss, places=10)
+        for p, g in zip(mlp.parameters(), expected_grads):
+            self.assertAlmostEqual(p.grad, g, places=10)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
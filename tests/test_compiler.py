@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mymicrograd
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from losses import MSELoss, HingeLoss
+from optimizers import SGD
+
+class TestCompiler(unittest.TestCase):
+
+    def assert_matches_eager(self, mlp, loss_fn, dataset):
+        compiled = mymicrograd.compile(mlp, loss_fn)
+        optimizer = SGD(mlp.parameters(), lr=0.05)
+        for _ in range(3):
+            for x, y in dataset:
+                mlp.zero_grad()
+                loss = loss_fn(mlp([Value(xi) for xi in x]), y)
+                loss.backward()
+                expected_loss = loss.data
+                expected_grads = [p.grad for p in mlp.parameters()]
+
+                mlp.zero_grad()
+                got_loss = compiled(x, y)
+                self.assertAlmostEqual(got_loss, expected_loss, places=12)
+                for p, g in zip(mlp.parameters(), expected_grads):
+                    self.assertAlmostEqual(p.grad, g, places=12)
+
+                # Parameters change between steps; the tape must follow them
+                optimizer.step()
+
+    def test_matches_eager_mse(self):
+        """Test that replayed steps match eager forward and backward"""
+        mlp = MLP(2, [4, 1])
+        mse = MSELoss()
+        dataset = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+        self.assert_matches_eager(mlp, lambda pred, y: mse([pred], [y]), dataset)
+
+    def test_matches_eager_multi_output(self):
+        """Test a multi-output model with a relu-based loss"""
+        mlp = MLP(3, [5, 2])
+        hinge = HingeLoss()
+        dataset = [([0.5, -1.0, 2.0], [1.0, -1.0]), ([0.1, 0.2, -0.3], [-1.0, 1.0])]
+        self.assert_matches_eager(mlp, lambda pred, y: hinge(pred, y), dataset)
+
+    def test_rejects_wrong_input_size(self):
+        """Test that a tape refuses inputs of a different size"""
+        compiled = mymicrograd.compile(MLP(2, [2, 1]), lambda pred, y: (pred - y) ** 2)
+        compiled([0.0, 1.0], 1.0)
+        with self.assertRaises(ValueError):
+            compiled([0.0, 1.0, 2.0], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
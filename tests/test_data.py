@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    from mymicrograd.data import DataLoader
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestDataLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.X = np.arange(30.0).reshape(10, 3)
+        self.y = np.arange(10.0)
+        self.x_path = os.path.join(self.tmp.name, 'X.npy')
+        self.y_path = os.path.join(self.tmp.name, 'y.npy')
+        np.save(self.x_path, self.X)
+        np.save(self.y_path, self.y)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches_from_npy(self):
+        """Test batching a memory-mapped .npy dataset in order"""
+        loader = DataLoader(self.x_path, self.y_path, batch_size=4)
+        self.assertIsInstance(loader.X, np.memmap)
+        batches = list(loader)
+        self.assertEqual(len(batches), len(loader))
+        self.assertEqual([len(X) for X, _ in batches], [4, 4, 2])
+        np.testing.assert_array_equal(np.concatenate([X for X, _ in batches]), self.X)
+        np.testing.assert_array_equal(np.concatenate([y for _, y in batches]), self.y)
+
+        self.assertEqual(len(DataLoader(self.X, self.y, batch_size=4, drop_last=True)), 2)
+
+    def test_seeded_shuffle(self):
+        """Test that shuffling covers every sample and is reproducible"""
+        def epochs(seed):
+            loader = DataLoader(self.X, self.y, batch_size=3, shuffle=True, seed=seed)
+            return [np.concatenate([y for _, y in loader]) for _ in range(2)]
+
+        first, second = epochs(7)
+        np.testing.assert_array_equal(np.sort(first), self.y)
+        self.assertFalse(np.array_equal(first, second))
+        for a, b in zip(epochs(7), (first, second)):
+            np.testing.assert_array_equal(a, b)
+
+        # Rows stay paired with their targets
+        for X, y in DataLoader(self.X, self.y, batch_size=3, shuffle=True, seed=1):
+            np.testing.assert_array_equal(X[:, 0], y * 3)
+
+    def test_binary_file(self):
+        """Test memory-mapping a headerless binary file"""
+        path = os.path.join(self.tmp.name, 'X.bin')
+        self.X.astype(np.float32).tofile(path)
+        loader = DataLoader.from_binary(path, shape=(10, 3), dtype=np.float32, batch_size=5, prefetch=0)
+        batches = list(loader)
+        self.assertEqual(batches[0][0].dtype, np.float64)
+        np.testing.assert_array_equal(np.concatenate([X for X, _ in batches]), self.X)
+        self.assertIsNone(batches[0][1])
+
+    def test_prefetch_early_exit(self):
+        """Test that leaving a prefetching loop early does not hang"""
+        loader = DataLoader(self.X, self.y, batch_size=1, prefetch=2)
+        for i, _ in enumerate(loader):
+            if i == 2:
+                break
+        self.assertEqual(len(list(loader)), 10)
+
+    def test_feeds_both_paths(self):
+        """Test that samples() and batches give the same model outputs"""
+        mlp = MLP(3, [4, 1])
+        loader = DataLoader(self.X / 30.0, self.y, batch_size=4)
+        per_sample = [mlp(x).data for x, _ in loader.samples()]
+        batched = np.concatenate([mlp.forward_batch(X).data[:, 0] for X, _ in loader])
+        np.testing.assert_allclose(batched, per_sample, rtol=1e-12)
+
+        x, target = next(loader.samples())
+        self.assertIsInstance(x[0], Value)
+        self.assertEqual(target, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value, set_default_dtype, get_default_dtype
+from mymicrograd.neuralnet import MLP
+from optimizers import SGD, SGDMomentum, Adam
+
+dataset = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+
+def train_xor(mlp, optimizer, epochs=40):
+    """Train on the XOR scenario from test_integration, returning the loss per epoch"""
+    losses = []
+    for _ in range(epochs):
+        total = Value(0.0)
+        for x, y in dataset:
+            total = total + (mlp([Value(xi) for xi in x]) - y) ** 2
+        optimizer.zero_grad()
+        total.backward()
+        optimizer.step()
+        losses.append(total.data)
+    return losses
+
+class TestDefaultDtype(unittest.TestCase):
+
+    def tearDown(self):
+        set_default_dtype('float64')
+
+    def test_set_and_get(self):
+        """Test that the setting accepts names and NumPy types and returns the previous one"""
+        self.assertEqual(get_default_dtype(), 'float64')
+        self.assertEqual(set_default_dtype('float32'), 'float64')
+        self.assertEqual(get_default_dtype(), 'float32')
+        if np is not None:
+            self.assertEqual(set_default_dtype(np.float64), 'float32')
+            self.assertEqual(set_default_dtype(np.dtype('float32')), 'float64')
+        with self.assertRaises(ValueError):
+            set_default_dtype('int8')
+
+    def test_scalar_values_unchanged(self):
+        """Test that unbuffered Values keep Python floats whatever the setting"""
+        set_default_dtype('float32')
+        x = Value(0.1) * 3
+        self.assertIs(type(x.data), float)
+        self.assertEqual(x.data, 0.1 * 3)
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFloat32(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(11)
+
+    def tearDown(self):
+        set_default_dtype('float64')
+
+    def test_buffer_and_optimizer_state(self):
+        """Test that a float32 module keeps parameters, grads and optimizer state in float32"""
+        mlp = MLP(3, [16, 1])
+        full = mlp.flatten_parameters()
+        reference = full.data.nbytes
+        full.release()
+        buffer = mlp.flatten_parameters(dtype='float32')
+        self.assertEqual(buffer.data.dtype, np.float32)
+        self.assertEqual(buffer.grad.dtype, np.float32)
+        self.assertEqual(buffer.data.nbytes * 2, reference)
+        self.assertIs(type(mlp.parameters()[0].data), float)
+
+        momentum = SGDMomentum(mlp.parameters(), lr=0.01)
+        adam = Adam(mlp.parameters(), lr=0.01)
+        for optimizer in (momentum, adam):
+            loss = mlp([Value(0.5), Value(-0.2), Value(0.1)]) ** 2
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+        self.assertEqual(momentum.velocities.dtype, np.float32)
+        self.assertEqual(adam.m.dtype, np.float32)
+        self.assertEqual(adam.v.dtype, np.float32)
+        self.assertEqual(buffer.data.dtype, np.float32)
+
+    def test_global_setting(self):
+        """Test that the global setting applies to new buffers, Tensors and batches"""
+        from mymicrograd.tensor import Tensor
+        from mymicrograd.data import DataLoader
+        set_default_dtype('float32')
+        self.assertEqual(MLP(2, [2, 1]).flatten_parameters().data.dtype, np.float32)
+        t = Tensor([[1, 2], [3, 4]])
+        self.assertEqual(t.data.dtype, np.float32)
+        # Floating arrays keep their own precision and constants follow the Tensor
+        self.assertEqual(Tensor(np.ones(2)).data.dtype, np.float64)
+        out = (t * 2.5 + np.ones((2, 2))).sum()
+        out.backward()
+        self.assertEqual(out.data.dtype, np.float32)
+        self.assertEqual(t.grad.dtype, np.float32)
+        X, y = next(iter(DataLoader(np.ones((4, 2)), np.ones(4), batch_size=4, prefetch=0)))
+        self.assertEqual((X.dtype, y.dtype), (np.float32, np.float32))
+
+    def test_state_dict_stays_float64(self):
+        """Test that a float32 module saves a float64 state that loads into either precision"""
+        mlp = MLP(2, [4, 1])
+        mlp.flatten_parameters(dtype='float32')
+        state = mlp.state_dict()
+        self.assertEqual(state['parameters'].typecode, 'd')
+        self.assertEqual(list(state['parameters']), [p.data for p in mlp.parameters()])
+        other = MLP(2, [4, 1])
+        other.load_state_dict(state)
+        self.assertEqual([p.data for p in other.parameters()], [p.data for p in mlp.parameters()])
+
+    def test_xor_converges(self):
+        """Test that the XOR integration scenario trains in float32 like in float64"""
+        for cls in (SGD, SGDMomentum, Adam):
+            curves = []
+            for dtype in ('float64', 'float32'):
+                random.seed(3)
+                mlp = MLP(2, [8, 1])
+                mlp.flatten_parameters(dtype=dtype)
+                curves.append(train_xor(mlp, cls(mlp.parameters(), lr=0.05)))
+            full, single = curves
+            self.assertLess(single[-1], single[0] * 0.5)
+            # Rounding parameters to float32 moves the loss curve only slightly
+            np.testing.assert_allclose(single, full, rtol=1e-3, atol=1e-5)
+
+    def test_batched_training_converges(self):
+        """Test that batched Tensor training in float32 converges to the float64 loss"""
+        rng = np.random.default_rng(0)
+        X = rng.uniform(-1, 1, (64, 3))
+        y = np.sin(X.sum(axis=1))
+        finals = {}
+        for dtype in ('float64', 'float32'):
+            set_default_dtype(dtype)
+            random.seed(5)
+            mlp = MLP(3, [16, 16, 1])
+            mlp.flatten_parameters()
+            optimizer = Adam(mlp.parameters(), lr=0.01)
+            losses = []
+            for _ in range(150):
+                pred = mlp.forward_batch(X.astype(dtype))
+                loss = pred.mse_loss(y)
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+                losses.append(float(loss.data))
+            self.assertEqual(pred.data.dtype, np.dtype(dtype))
+            self.assertEqual(optimizer.m.dtype, np.dtype(dtype))
+            self.assertLess(losses[-1], losses[0] * 0.1)
+            finals[dtype] = losses[-1]
+        self.assertAlmostEqual(finals['float32'], finals['float64'], delta=1e-3 + 0.05 * finals['float64'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mymicrograd.engine import Value
+from mymicrograd.engine import Value, no_grad, is_grad_enabled
 
 class TestValue(unittest.TestCase):
     
@@ -98,5 +98,224 @@ class TestValue(unittest.TestCase):
         self.assertAlmostEqual(x.grad, 7.0, places=5)
         self.assertAlmostEqual(y.grad, 2.0, places=5)
 
+    def test_deep_graph_backward(self):
+        """Test backward on a graph deeper than the recursion limit"""
+        x = Value(1.0)
+        total = Value(0.0)
+        depth = sys.getrecursionlimit() * 5
+        for _ in range(depth):
+            total = total + x
+        total.backward()
+
+        self.assertEqual(total.data, float(depth))
+        self.assertEqual(x.grad, float(depth))
+
+    def test_topo_order_reuse(self):
+        """Test that a kept topological order can be reused in backward"""
+        x = Value(2.0)
+        y = Value(3.0)
+        z = x * y + x ** 2
+        topo = z.topo_order()
+
+        # Every node appears after all of its children
+        position = {node: i for i, node in enumerate(topo)}
+        self.assertEqual(topo[-1], z)
+        for node in topo:
+            for child in node._prev:
+                self.assertLess(position[child], position[node])
+
+        z.backward(topo=topo, retain_graph=True)
+        self.assertAlmostEqual(x.grad, 7.0, places=5)
+
+        x.grad = 0.0
+        y.grad = 0.0
+        z.backward(topo=topo, retain_graph=True)
+        self.assertAlmostEqual(x.grad, 7.0, places=5)
+        self.assertAlmostEqual(y.grad, 2.0, places=5)
+
+    def test_compact_node_layout(self):
+        """Test that nodes use slots, tuple children and op codes"""
+        a = Value(2.0)
+        b = Value(3.0, label='b')
+        c = a * b
+
+        self.assertFalse(hasattr(c, '__dict__'))
+        self.assertEqual(c._prev, (a, b))
+        self.assertEqual(c._op, '*')
+        self.assertEqual(a.label, '')
+        self.assertEqual(b.label, 'b')
+
+        d = a ** 3
+        self.assertEqual(d._op, '**')
+        self.assertEqual(d._arg, 3)
+        d._backward()
+        self.assertEqual(a.grad, 0.0)  # d.grad is still zero
+        d.grad = 1.0
+        d._backward()
+        self.assertAlmostEqual(a.grad, 12.0, places=5)
+
+    def test_no_grad(self):
+        """Test that no_grad computes results without building a graph"""
+        x = Value(0.5)
+        with no_grad():
+            self.assertFalse(is_grad_enabled())
+            y = (x * 2 + 1).tanh() ** 2
+        self.assertTrue(is_grad_enabled())
+
+        self.assertAlmostEqual(y.data, math.tanh(2.0) ** 2, places=10)
+        self.assertEqual(y._prev, ())
+        self.assertEqual(y._op, '')
+        y.backward()
+        self.assertEqual(x.grad, 0.0)
+
+        @no_grad()
+        def predict(v):
+            return v * v
+
+        z = predict(x)
+        self.assertEqual(z._prev, ())
+        self.assertTrue(is_grad_enabled())
+        self.assertEqual(len((x * x)._prev), 2)
+
+    def test_no_grad_is_per_thread(self):
+        """Test that no_grad in one thread does not turn off another thread's graph"""
+        import threading
+        entered = threading.Event()
+        done = threading.Event()
+
+        def score():
+            with no_grad():
+                entered.set()
+                done.wait(5)
+
+        scorer = threading.Thread(target=score)
+        scorer.start()
+        try:
+            self.assertTrue(entered.wait(5))
+            self.assertTrue(is_grad_enabled())
+            x = Value(3.0)
+            (x * x).backward()
+            self.assertEqual(x.grad, 6.0)
+        finally:
+            done.set()
+            scorer.join()
+
+    def test_fused_dot(self):
+        """Test that Value.dot matches the unfused weighted sum"""
+        ws = [Value(0.5), Value(-1.5), Value(2.0)]
+        xs = [Value(1.0), Value(3.0), 0.25]
+        b = Value(0.1)
+        out = Value.dot(ws, xs, b)
+
+        self.assertEqual(out._op, 'dot')
+        self.assertAlmostEqual(out.data, 0.5 - 4.5 + 0.5 + 0.1, places=10)
+        out.tanh().backward()
+
+        fused = [v.grad for v in ws + xs[:2] + [b]]
+        for v in ws + xs[:2] + [b]:
+            v.grad = 0.0
+        unfused = (sum(w * x for w, x in zip(ws, xs)) + b).tanh()
+        unfused.backward()
+        for got, v in zip(fused, ws + xs[:2] + [b]):
+            self.assertAlmostEqual(got, v.grad, places=10)
+
+    def test_backward_releases_graph(self):
+        """Test that backward frees the graph unless asked to retain it"""
+        x = Value(2.0)
+        y = Value(3.0)
+        z = (x * y + x ** 2).tanh()
+        z.backward()
+
+        self.assertAlmostEqual(x.grad, (1 - z.data ** 2) * 7.0, places=10)
+        self.assertEqual(z._prev, ())
+        self.assertEqual(z.topo_order(), [z])
+
+        w = x * y
+        w.backward(retain_graph=True)
+        self.assertEqual(w._prev, (x, y))
+
+    def test_freed_graph_raises(self):
+        """Test that backpropagating through a freed graph raises instead of dropping gradients"""
+        x = Value(2.0)
+        h = x * x
+        l1 = h * 3
+        l2 = h * 5
+        l1.backward()
+        with self.assertRaises(RuntimeError):
+            l2.backward()
+        with self.assertRaises(RuntimeError):
+            l1.backward()
+
+        # Retaining the shared subgraph gives both losses' gradients
+        x = Value(2.0)
+        h = x * x
+        l1 = h * 3
+        l2 = h * 5
+        l1.backward(retain_graph=True)
+        l2.backward()
+        self.assertEqual(x.grad, 32.0)
+
+    def test_detach(self):
+        """Test that a detached Value keeps the data but not the history"""
+        x = Value(2.0)
+        y = x * x
+        d = y.detach()
+        self.assertEqual(d.data, 4.0)
+        self.assertEqual(d._prev, ())
+        (d * 3).backward()
+        self.assertEqual(x.grad, 0.0)
+
+    def test_scalar_constant_ops(self):
+        """Test that number operands stay inside their node and create no leaves"""
+        x = Value(3.0)
+        exprs = [
+            (lambda v: v + 2.0, 5.0, 1.0, '+c'),
+            (lambda v: 2.0 + v, 5.0, 1.0, '+c'),
+            (lambda v: v * 4.0, 12.0, 4.0, '*c'),
+            (lambda v: -v, -3.0, -1.0, '*c'),
+            (lambda v: v - 1.0, 2.0, 1.0, '+c'),
+            (lambda v: v / 2.0, 1.5, 0.5, '*c'),
+            (lambda v: 6.0 / v, 2.0, -6.0 / 9.0, 'c/'),
+        ]
+        for f, data, grad, op in exprs:
+            x.grad = 0.0
+            out = f(x)
+            self.assertEqual(out._op, op)
+            self.assertEqual(out.topo_order(), [x, out])
+            out.backward()
+            self.assertAlmostEqual(out.data, data, places=12)
+            self.assertAlmostEqual(x.grad, grad, places=12)
+
+    def test_division(self):
+        """Test that Value / Value is a single node with quotient-rule gradients"""
+        a = Value(3.0)
+        b = Value(4.0)
+        c = a / b
+        self.assertEqual(c._op, '/')
+        self.assertEqual(len(c.topo_order()), 3)
+        c.backward()
+        self.assertAlmostEqual(c.data, 0.75)
+        self.assertAlmostEqual(a.grad, 0.25)
+        self.assertAlmostEqual(b.grad, -3.0 / 16.0)
+
+    def test_interned_constants(self):
+        """Test that Value.const shares leaves that never hold a gradient"""
+        self.assertIs(Value.const(1.5), Value.const(1.5))
+        w = Value(2.0)
+        out = Value.dot([w], [1.5])
+        out.backward()
+        self.assertEqual(w.grad, 1.5)
+        self.assertEqual(Value.const(1.5).grad, 0.0)
+
+        # Equal numbers of different types get their own constants
+        self.assertIs(type(Value.const(True).data), bool)
+        self.assertIs(type(Value.const(1.0).data), float)
+
+        # Runtime inputs to dot are not interned
+        from mymicrograd import engine
+        size = len(engine._CONSTANTS)
+        Value.dot([w, w], [123.25, -7.125], 0.5)
+        self.assertEqual(len(engine._CONSTANTS), size)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import unittest
+import math
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value, profile
+from mymicrograd.forward import Dual, jvp
+from mymicrograd.neuralnet import MLP
+
+class TestForwardMode(unittest.TestCase):
+
+    def test_op_derivatives(self):
+        """Test each op's tangent against reverse mode on the same expression"""
+        exprs = [
+            lambda x: x + 3.0,
+            lambda x: 2.0 * x * x,
+            lambda x: x ** 3,
+            lambda x: x.exp(),
+            lambda x: x.tanh(),
+            lambda x: x.relu(),
+            lambda x: (-x).relu(),
+            lambda x: 1.5 - x,
+            lambda x: (x * x + 1.0) ** -1,
+        ]
+        for f in exprs:
+            x = Value(0.7)
+            out = f(x)
+            out.backward()
+            d = f(Dual(0.7, 1.0))
+            self.assertAlmostEqual(d.primal, out.data, places=12)
+            self.assertAlmostEqual(d.tangent, x.grad, places=12)
+
+    def test_division(self):
+        """Test quotient-rule tangents for Dual and number operands"""
+        x = Dual(2.0, 1.0)
+        self.assertAlmostEqual((x / 4.0).tangent, 0.25)
+        self.assertAlmostEqual((3.0 / x).tangent, -3.0 / 4.0)
+        self.assertAlmostEqual((x / x).tangent, 0.0)
+
+    def test_mixes_with_values(self):
+        """Test that Values act as constants next to Duals on either side"""
+        w = Value(3.0)
+        x = Dual(2.0, 1.0)
+        for out in (w * x, x * w, w + x, x - w, w - x):
+            self.assertIsInstance(out, Dual)
+        self.assertEqual((w * x).tangent, 3.0)
+        self.assertEqual((w - x).tangent, -1.0)
+        self.assertEqual(w._prev, ())
+
+    def test_mlp_jvp_matches_reverse_mode(self):
+        """Test jvp through an MLP against directional derivatives from backward()"""
+        random.seed(4)
+        mlp = MLP(3, [5, 2])
+        x = [0.3, -0.2, 0.8]
+        v = [1.0, 0.5, -2.0]
+        outputs, tangents = jvp(mlp, x, v)
+
+        for k in range(2):
+            xs = [Value(xi) for xi in x]
+            out = mlp(xs)[k]
+            out.backward()
+            self.assertAlmostEqual(outputs[k], out.data, places=12)
+            self.assertAlmostEqual(tangents[k], sum(xi.grad * vi for xi, vi in zip(xs, v)), places=12)
+
+    def test_jvp_builds_no_graph(self):
+        """Test that a forward-mode pass through an MLP creates no Values"""
+        mlp = MLP(2, [3, 1])
+        with profile() as prof:
+            output, tangent = jvp(mlp, [0.1, 0.2], [1.0, 0.0])
+        self.assertEqual(sum(prof.nodes.values()), 0)
+        self.assertIsInstance(output, float)
+        self.assertTrue(math.isfinite(tangent))
+
+    def test_mismatched_tangents(self):
+        """Test that jvp needs one tangent per primal"""
+        with self.assertRaises(ValueError):
+            jvp(lambda xs: xs[0], [1.0, 2.0], [1.0])
+
+if __name__ == '__main__':
+    unittest.main()
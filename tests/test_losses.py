@@ -0,0 +1,133 @@
+import unittest
+import math
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import mymicrograd
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from losses import MSELoss, CrossEntropyLoss, HingeLoss
+
+class TestLosses(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        self.preds = [random.uniform(-2, 2) for _ in range(5)]
+        self.binary = [random.choice((0.0, 1.0)) for _ in range(5)]
+        self.signs = [random.choice((-1.0, 1.0)) for _ in range(5)]
+
+    def test_fused_losses_are_one_node(self):
+        """Test that each loss adds a single node over all pairs"""
+        preds = [Value(p) for p in self.preds]
+        for loss_fn in (MSELoss(), CrossEntropyLoss(), HingeLoss()):
+            loss = loss_fn(preds, self.signs)
+            interior = [node for node in loss.topo_order() if node._op]
+            self.assertEqual(len(interior), 1)
+
+    def test_mse_and_hinge_match_unfused(self):
+        """Test fused MSE and hinge against graphs of elementary ops"""
+        cases = ((MSELoss(), lambda p, y: (p - y) ** 2), (HingeLoss(), lambda p, y: (1 - y * p).relu()))
+        for loss_fn, elementwise in cases:
+            preds = [Value(p) for p in self.preds]
+            loss = loss_fn(preds, self.signs)
+            loss.backward()
+
+            ref_preds = [Value(p) for p in self.preds]
+            total = Value(0.0)
+            for p, y in zip(ref_preds, self.signs):
+                total = total + elementwise(p, y)
+            total = total * (1.0 / len(ref_preds))
+            total.backward()
+
+            self.assertAlmostEqual(loss.data, total.data, places=12)
+            for p, q in zip(preds, ref_preds):
+                self.assertAlmostEqual(p.grad, q.grad, places=12)
+
+    def test_cross_entropy_with_logits(self):
+        """Test BCE-with-logits values and gradients, including huge logits"""
+        preds = [Value(p) for p in self.preds]
+        loss = CrossEntropyLoss()(preds, self.binary)
+        loss.backward()
+        n = len(preds)
+        expected = sum(math.log1p(math.exp(z)) - z * y for z, y in zip(self.preds, self.binary)) / n
+        self.assertAlmostEqual(loss.data, expected, places=12)
+        for p, z, y in zip(preds, self.preds, self.binary):
+            self.assertAlmostEqual(p.grad, (1 / (1 + math.exp(-z)) - y) / n, places=12)
+
+        z = Value(1000.0)
+        loss = CrossEntropyLoss()(z, 0.0)
+        loss.backward()
+        self.assertAlmostEqual(loss.data, 1000.0)
+        self.assertAlmostEqual(z.grad, 1.0)
+        loss = CrossEntropyLoss()(Value(-1000.0), 0.0)
+        self.assertEqual(loss.data, 0.0)
+
+    def test_targets_not_interned(self):
+        """Test that numeric loss targets do not fill the shared constant table"""
+        from mymicrograd import engine
+        size = len(engine._CONSTANTS)
+        pred = Value(0.5)
+        for i in range(50):
+            target = 1000.0 + i / 7
+            Value.mse_loss([pred], [target]).backward()
+            Value.bce_with_logits([pred], [target]).backward()
+            Value.hinge_loss([pred], [target]).backward()
+        self.assertEqual(len(engine._CONSTANTS), size)
+
+    def test_mismatched_lengths(self):
+        """Test that predictions and targets must pair up"""
+        with self.assertRaises(ValueError):
+            MSELoss()([Value(1.0), Value(2.0)], [1.0])
+
+    def test_compiled_backends_match_eager(self):
+        """Test that every compiler backend replays the fused losses exactly"""
+        backends = ('tape', 'python') + (('numpy',) if np is not None else ())
+        dataset = [([0.5, -1.0], [1.0, 0.0]), ([0.1, 0.7], [0.0, 1.0]), ([-0.4, 0.3], [1.0, 1.0])]
+        for loss_fn in (MSELoss(), CrossEntropyLoss(), HingeLoss()):
+            mlp = MLP(2, [3, 2])
+            expected_loss = 0.0
+            expected_grads = [0.0] * len(mlp.parameters())
+            for x, y in dataset:
+                mlp.zero_grad()
+                loss = loss_fn(mlp([Value(xi) for xi in x]), y)
+                loss.backward()
+                expected_loss += loss.data
+                expected_grads = [g + p.grad for g, p in zip(expected_grads, mlp.parameters())]
+
+            for backend in backends:
+                compiled = mymicrograd.compile(mlp, loss_fn, backend=backend)
+                mlp.zero_grad()
+                if backend == 'numpy':
+                    got = compiled([x for x, _ in dataset], [y for _, y in dataset])
+                else:
+                    got = sum(compiled(x, y) for x, y in dataset)
+                self.assertAlmostEqual(got, expected_loss, places=10)
+                for p, g in zip(mlp.parameters(), expected_grads):
+                    self.assertAlmostEqual(p.grad, g, places=10)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batched_tensor_losses(self):
+        """Test that the Tensor kernels match the Value kernels"""
+        from mymicrograd.tensor import Tensor
+        targets = {MSELoss: self.signs, CrossEntropyLoss: self.binary, HingeLoss: self.signs}
+        for cls, y in targets.items():
+            preds = [Value(p) for p in self.preds]
+            loss = cls()(preds, y)
+            loss.backward()
+
+            batch = Tensor(np.array(self.preds).reshape(-1, 1))
+            batch_loss = cls()(batch, np.array(y))
+            batch_loss.backward()
+            self.assertEqual(batch_loss.data.shape, ())
+            self.assertAlmostEqual(float(batch_loss.data), loss.data, places=12)
+            np.testing.assert_allclose(batch.grad.ravel(), [p.grad for p in preds], atol=1e-12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mymicrograd.engine import Value
+from mymicrograd.engine import Value, no_grad
 from mymicrograd.neuralnet import Neuron, Layer, MLP, Module
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class TestNeuralNet(unittest.TestCase):
     
     def test_neuron_creation(self):
@@ -116,5 +121,51 @@ class TestNeuralNet(unittest.TestCase):
         for param in mlp.parameters():
             self.assertNotEqual(param.grad, 0.0)
 
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_forward_batch_matches_per_sample(self):
+        """Test that the batched pass gives the per-sample outputs and gradients"""
+        mlp = MLP(3, [4, 2])
+        X = [[0.5, -1.0, 2.0], [0.0, 0.3, -0.7], [1.0, 1.0, 1.0]]
+
+        # Per-sample path: one graph per sample, summed
+        total = Value(0.0)
+        per_sample = []
+        for x in X:
+            out = mlp([Value(xi) for xi in x])
+            per_sample.append([o.data for o in out])
+            total = total + sum(o * o for o in out)
+        mlp.zero_grad()
+        total.backward()
+        per_sample_grads = [p.grad for p in mlp.parameters()]
+
+        # Batched path: one graph for the whole batch
+        out = mlp.forward_batch(np.array(X))
+        self.assertEqual(out.data.shape, (3, 2))
+        np.testing.assert_allclose(out.data, per_sample, rtol=1e-12)
+
+        mlp.zero_grad()
+        (out * out).sum().backward()
+        np.testing.assert_allclose([p.grad for p in mlp.parameters()], per_sample_grads, rtol=1e-9, atol=1e-12)
+
+    def test_inference_without_graph(self):
+        """Test that an MLP under no_grad returns the same output with no graph"""
+        mlp = MLP(3, [4, 1])
+        x = [Value(1.0), Value(-2.0), Value(0.5)]
+        expected = mlp(x).data
+
+        with no_grad():
+            output = mlp(x)
+        self.assertEqual(output.data, expected)
+        self.assertEqual(output.topo_order(), [output])
+
+    def test_neuron_graph_size(self):
+        """Test that a neuron builds one node for its weighted sum"""
+        neuron = Neuron(100)
+        x = [Value(0.01 * i) for i in range(100)]
+        output = neuron(x)
+
+        # 101 parameters + 100 inputs + dot node + tanh node
+        self.assertEqual(len(output.topo_order()), 203)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
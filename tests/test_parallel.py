@@ -0,0 +1,45 @@
+import unittest
+import copy
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from mymicrograd.parallel import DataParallelTrainer
+from optimizers import SGD
+
+def squared_error(pred, y):
+    return (pred - y) ** 2
+
+class TestDataParallel(unittest.TestCase):
+
+    def test_matches_single_process(self):
+        """Test that data-parallel steps reproduce single-process training"""
+        random.seed(1)
+        reference = MLP(3, [4, 1])
+        model = copy.deepcopy(reference)
+        dataset = [([random.uniform(-1, 1) for _ in range(3)], random.uniform(-1, 1)) for _ in range(10)]
+
+        optimizer = SGD(reference.parameters(), lr=0.05)
+        expected_losses = []
+        for _ in range(3):
+            total = Value(0.0)
+            for x, y in dataset:
+                total = total + squared_error(reference([Value(xi) for xi in x]), y)
+            optimizer.zero_grad()
+            total.backward()
+            optimizer.step()
+            expected_losses.append(total.data)
+
+        with DataParallelTrainer(model, squared_error, SGD(model.parameters(), lr=0.05), workers=3) as trainer:
+            losses = [trainer.step(dataset) for _ in range(3)]
+
+        for got, expected in zip(losses, expected_losses):
+            self.assertAlmostEqual(got, expected, places=10)
+        for p, q in zip(model.parameters(), reference.parameters()):
+            self.assertAlmostEqual(p.data, q.data, places=10)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
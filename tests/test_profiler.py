@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd import engine
+from mymicrograd.engine import Value, profile
+from mymicrograd.neuralnet import MLP, Layer
+
+class TestProfiler(unittest.TestCase):
+
+    def test_counts_and_timings(self):
+        """Test node counts per op, backward timings and graph shape"""
+        x = Value(0.5)
+        with profile() as prof:
+            y = (x * 2.0 + 1.0).tanh() ** 2
+            y.backward()
+
+        self.assertEqual(prof.nodes['*c'], 1)
+        self.assertEqual(prof.nodes['+c'], 1)
+        self.assertEqual(prof.nodes['tanh'], 1)
+        self.assertEqual(prof.nodes['**'], 1)
+        self.assertEqual(prof.nodes['leaf'], 0)  # constants stay inside their nodes
+        self.assertEqual(prof.forward['tanh'][0], 1)
+        self.assertEqual(prof.backward['tanh'][0], 1)
+        self.assertEqual(len(prof.topo), 1)
+        self.assertEqual(prof.topo[0]['nodes'], 5)
+        self.assertEqual(prof.topo[0]['depth'], 4)
+        self.assertIn('tanh', prof.report())
+
+    def test_results_unchanged_and_patches_removed(self):
+        """Test that profiling does not change results and leaves nothing behind"""
+        originals = dict(Value.__dict__)
+        rules = dict(engine._BACKWARD)
+        topo_order = engine._topo_order
+
+        mlp = MLP(2, [3, 1])
+        x = [Value(0.3), Value(-0.4)]
+        mlp(x).backward()
+        expected = [p.grad for p in mlp.parameters()]
+        mlp.zero_grad()
+
+        with profile():
+            mlp(x).backward()
+        self.assertEqual([p.grad for p in mlp.parameters()], expected)
+
+        self.assertEqual(dict(Value.__dict__), originals)
+        self.assertEqual(engine._BACKWARD, rules)
+        self.assertIs(engine._topo_order, topo_order)
+        self.assertEqual(Layer.__dict__['__call__'].__qualname__, 'Layer.__call__')
+
+    def test_layer_breakdown_and_chrome_trace(self):
+        """Test per-layer statistics and the exported Chrome trace"""
+        mlp = MLP(2, [3, 1])
+        with profile() as prof:
+            mlp([Value(0.3), Value(-0.4)]).backward()
+
+        self.assertEqual(prof.modules['MLP'][0], 1)
+        self.assertEqual(prof.modules['MLP.layers.0'][2], 6)  # dot + tanh per neuron
+        self.assertIn('MLP.layers.1.neurons.0', prof.modules)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            prof.export_chrome_trace(path)
+            with open(path) as f:
+                events = json.load(f)['traceEvents']
+        names = {event['name'] for event in events}
+        self.assertTrue({'MLP', 'MLP.layers.0', 'backward', 'topo_sort'} <= names)
+        for event in events:
+            self.assertEqual(event['ph'], 'X')
+            self.assertGreaterEqual(event['dur'], 0)
+
+    def test_not_reentrant(self):
+        """Test that only one profiler can be active at a time"""
+        with profile():
+            with self.assertRaises(RuntimeError):
+                with profile():
+                    pass
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value, profile
+from mymicrograd.neuralnet import Neuron, Layer, MLP
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestQuantize(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        self.mlp = MLP(4, [8, 8, 2])
+        self.X = np.array([[random.uniform(-1, 1) for _ in range(4)] for _ in range(32)])
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'model.int8')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_close_to_float_model(self):
+        """Test that int8 outputs stay close to the float model's for both scale granularities"""
+        from mymicrograd.quantize import quantize, compare
+        for per in ('neuron', 'layer'):
+            quantized = quantize(self.mlp, per)
+            self.assertEqual(quantized.weights()[0].dtype, np.int8)
+            report = compare(self.mlp, quantized, self.X)
+            self.assertLess(report['max_abs_diff'], 0.05)
+            self.assertLess(report['quantized_storage_bytes'], report['float_bytes'] / 4)
+            self.assertLess(report['quantized_bytes'], report['float_bytes'] * 0.6)
+
+    def test_single_sample(self):
+        """Test that a single input vector gives one output row"""
+        from mymicrograd.quantize import quantize
+        x = self.X[0].tolist()
+        out = quantize(self.mlp)(x)
+        expected = [v.data for v in self.mlp([Value(xi) for xi in x])]
+        np.testing.assert_allclose(out, expected, atol=0.05)
+
+    def test_export_and_load(self):
+        """Test that an exported file reloads to the same outputs without building Values"""
+        from mymicrograd.quantize import quantize, export, QuantizedMLP
+        y = np.zeros((len(self.X), 2))
+        report = export(self.mlp, self.path, self.X, y)
+        self.assertIn('quantized_mse', report)
+        self.assertLess(abs(report['quantized_mse'] - report['float_mse']), 0.01)
+
+        with profile() as prof:
+            loaded = QuantizedMLP.load(self.path)
+            out = loaded(self.X)
+        self.assertEqual(sum(prof.nodes.values()), 0)
+        np.testing.assert_array_equal(out, quantize(self.mlp)(self.X))
+
+    def test_file_size(self):
+        """Test that the int8 file is much smaller than a float64 checkpoint"""
+        from mymicrograd.quantize import quantize
+        from mymicrograd.serialization import save
+        mlp = MLP(16, [64, 64, 1])
+        quantize(mlp).save(self.path)
+        float_path = os.path.join(self.tmp.name, 'model.ckpt')
+        save(mlp.state_dict(), float_path)
+        self.assertLess(os.path.getsize(self.path), os.path.getsize(float_path) / 4)
+
+    def test_memory_and_storage_bytes(self):
+        """Test that nbytes() counts every array held and the int8 storage is a quarter of it"""
+        from mymicrograd.quantize import quantize
+        mlp = MLP(256, [256, 256, 1])
+        quantized = quantize(mlp)
+        arrays = [a for layer in quantized.layers for a in layer if isinstance(a, np.ndarray)]
+        self.assertEqual(list(vars(quantized)), ['layers'])
+        self.assertEqual(sum(a.nbytes for a in arrays), quantized.nbytes())
+        self.assertLess(quantized.nbytes(), len(mlp.parameters()) * 8 / 1.9)
+        self.assertLess(quantized.storage_nbytes(), quantized.nbytes() / 3.5)
+
+    def test_layer_and_neuron(self):
+        """Test that a single Layer or Neuron can be quantized too"""
+        from mymicrograd.quantize import quantize, compare
+        for model in (Layer(4, 3), Neuron(4)):
+            report = compare(model, quantize(model), self.X)
+            self.assertLess(report['max_abs_diff'], 0.05)
+
+    def test_rejects_other_files(self):
+        """Test that load refuses a checkpoint that is not a quantized MLP"""
+        from mymicrograd.quantize import QuantizedMLP
+        from mymicrograd.serialization import save
+        save(self.mlp.state_dict(), self.path)
+        with self.assertRaises(ValueError):
+            QuantizedMLP.load(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
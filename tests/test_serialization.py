@@ -0,0 +1,105 @@
+import unittest
+import copy
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from mymicrograd.serialization import save, load
+from optimizers import SGD, SGDMomentum, Adam
+
+dataset = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+
+def train(mlp, optimizer, epochs):
+    for _ in range(epochs):
+        total = Value(0.0)
+        for x, y in dataset:
+            total = total + (mlp([Value(xi) for xi in x]) - y) ** 2
+        optimizer.zero_grad()
+        total.backward()
+        optimizer.step()
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'model.ckpt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_module_round_trip(self):
+        """Test that module parameters round-trip bit-exact"""
+        mlp = MLP(3, [4, 2])
+        for p in mlp.parameters():
+            p.data = p.data / 3.0
+        save(mlp.state_dict(), self.path)
+
+        for mmap in (True, False):
+            restored = MLP(3, [4, 2])
+            restored.load_state_dict(load(self.path, mmap=mmap))
+            self.assertEqual([p.data for p in restored.parameters()],
+                             [p.data for p in mlp.parameters()])
+
+        with self.assertRaises(ValueError):
+            MLP(3, [5, 2]).load_state_dict(load(self.path))
+
+    def test_optimizer_resume(self):
+        """Test that resuming from a checkpoint continues training exactly"""
+        for make_optimizer in (lambda ps: SGD(ps, lr=0.1),
+                               lambda ps: SGDMomentum(ps, lr=0.1, momentum=0.8),
+                               lambda ps: Adam(ps, lr=0.05)):
+            mlp = MLP(2, [4, 1])
+            optimizer = make_optimizer(mlp.parameters())
+            train(mlp, optimizer, 3)
+            save({'model': mlp.state_dict(), 'optimizer': optimizer.state_dict()}, self.path)
+
+            resumed = copy.deepcopy(mlp)
+            train(mlp, optimizer, 3)
+
+            state = load(self.path)
+            resumed.load_state_dict(state['model'])
+            resumed_optimizer = make_optimizer(resumed.parameters())
+            resumed_optimizer.load_state_dict(state['optimizer'])
+            train(resumed, resumed_optimizer, 3)
+
+            self.assertEqual([p.data for p in resumed.parameters()],
+                             [p.data for p in mlp.parameters()])
+
+    def test_rejects_other_files(self):
+        """Test that loading a file that is not a checkpoint fails clearly"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a checkpoint')
+        with self.assertRaises(ValueError):
+            load(self.path)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_flat_buffer_round_trip(self):
+        """Test checkpoints of flattened modules and vectorized optimizer state"""
+        mlp = MLP(2, [4, 1])
+        mlp.flatten_parameters()
+        optimizer = Adam(mlp.parameters(), lr=0.05)
+        train(mlp, optimizer, 2)
+        save({'model': mlp.state_dict(), 'optimizer': optimizer.state_dict()}, self.path)
+
+        state = load(self.path)
+        restored = MLP(2, [4, 1])
+        restored.flatten_parameters()
+        restored.load_state_dict(state['model'])
+        restored_optimizer = Adam(restored.parameters())
+        restored_optimizer.load_state_dict(state['optimizer'])
+
+        self.assertEqual([p.data for p in restored.parameters()], [p.data for p in mlp.parameters()])
+        np.testing.assert_array_equal(restored_optimizer.m, optimizer.m)
+        self.assertEqual(restored_optimizer.t, 2)
+        self.assertEqual(restored_optimizer.lr, 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import unittest
+import asyncio
+import json
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestInferenceServer(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(5)
+        self.inputs = [[random.uniform(-1, 1) for _ in range(3)] for _ in range(20)]
+
+    def test_batches_concurrent_requests(self):
+        """Test that concurrent requests share batches and get the eager answers"""
+        from mymicrograd.serving import InferenceServer
+        model = MLP(3, [4, 1])
+
+        async def run():
+            async with InferenceServer(model, max_batch_size=8, max_delay=0.01) as server:
+                results = await asyncio.gather(*(server.predict(x) for x in self.inputs))
+                return results, server.stats()
+
+        results, stats = asyncio.run(run())
+        for x, got in zip(self.inputs, results):
+            self.assertAlmostEqual(got, model([Value(v) for v in x]).data, places=12)
+        self.assertEqual(stats['requests'], 20)
+        self.assertLess(stats['batches'], 20)
+        self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+
+    def test_close_fails_waiting_requests(self):
+        """Test that close() answers requests still queued with an error instead of leaving them pending"""
+        from mymicrograd.serving import InferenceServer
+        model = MLP(3, [4, 1])
+
+        async def run():
+            server = await InferenceServer(model, max_batch_size=64, max_delay=10.0).start()
+            pending = [asyncio.ensure_future(server.predict(x)) for x in self.inputs]
+            await asyncio.sleep(0.05)
+            await server.close()
+            return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1.0)
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 20)
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+            self.assertIn('server closed', str(result))
+
+    def test_socket_round_trip(self):
+        """Test predictions and stats over the newline-delimited JSON socket"""
+        from mymicrograd.serving import InferenceServer
+        model = MLP(3, [4, 2])
+
+        async def client(port, xs):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            replies = []
+            for x in xs:
+                writer.write(json.dumps(x).encode() + b'\n')
+                await writer.drain()
+                replies.append(json.loads(await reader.readline()))
+            writer.write(b'[1.0]\nstats\n')
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+            replies.append(json.loads(await reader.readline()))
+            writer.close()
+            return replies
+
+        async def run():
+            async with InferenceServer(model) as server:
+                port = await server.serve()
+                return await asyncio.gather(client(port, self.inputs[:10]), client(port, self.inputs[10:]))
+
+        first, second = asyncio.run(run())
+        for x, got in zip(self.inputs, first[:10] + second[:10]):
+            expected = [out.data for out in model([Value(v) for v in x])]
+            np.testing.assert_allclose(got, expected, atol=1e-12)
+        self.assertIn('error', first[10])
+        self.assertGreaterEqual(second[11]['requests'], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import Layer, MLP
+from mymicrograd.sparse import SparseLayer, prune
+from optimizers import SGD, Adam
+
+dataset = [([0.0, 0.0], 0.0), ([0.0, 1.0], 1.0), ([1.0, 0.0], 1.0), ([1.0, 1.0], 0.0)]
+
+class TestSparse(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(8)
+
+    def test_dense_equivalent(self):
+        """Test that an unpruned SparseLayer matches its dense Layer in forward and backward"""
+        layer = Layer(4, 3)
+        sparse = SparseLayer.from_layer(layer)
+        self.assertEqual(sparse.nnz, 12)
+        x = [0.1, -0.4, 0.7, 0.2]
+        results = []
+        for module in (layer, sparse):
+            xs = [Value(v) for v in x]
+            out = module(xs)
+            sum(out, Value(0.0)).backward()
+            results.append(([o.data for o in out], [p.grad for p in module.parameters()], [v.grad for v in xs]))
+        for got, expected in zip(*results):
+            for a, b in zip(got, expected):
+                self.assertAlmostEqual(a, b, places=12)
+
+    def test_prune_keeps_largest(self):
+        """Test that pruning keeps the largest weights and zeroes the rest"""
+        mlp = MLP(8, [10, 1])
+        dense = [[[w.data for w in n.w] for n in layer.neurons] for layer in mlp.layers]
+        x = [random.uniform(-1, 1) for _ in range(8)]
+        prune(mlp, 0.9)
+        first = mlp.layers[0]
+        self.assertEqual(first.nnz, 8)
+        self.assertAlmostEqual(first.density, 0.1)
+
+        kept = sorted((abs(w) for row in dense[0] for w in row), reverse=True)[:8]
+        self.assertEqual(sorted((abs(w.data) for w in first.weights), reverse=True), kept)
+
+        # The pruned model computes the dense model with the small weights set to zero
+        masked = MLP(8, [10, 1])
+        for layer, sparse, rows in zip(masked.layers, mlp.layers, dense):
+            cutoff = min(abs(w.data) for w in sparse.weights)
+            for n, row in zip(layer.neurons, rows):
+                n.b.data = 0.0
+                for w, v in zip(n.w, row):
+                    w.data = v if abs(v) >= cutoff else 0.0
+        self.assertAlmostEqual(mlp([Value(v) for v in x]).data, masked([Value(v) for v in x]).data, places=12)
+
+    def test_trains_with_optimizers(self):
+        """Test that a pruned MLP trains with SGD and Adam, also on a flat buffer"""
+        flat = (False, True) if np is not None else (False,)
+        for cls in (SGD, Adam):
+            for flatten in flat:
+                mlp = prune(MLP(2, [8, 1]), 0.5)
+                if flatten:
+                    mlp.flatten_parameters()
+                optimizer = cls(mlp.parameters(), lr=0.05)
+                losses = []
+                for _ in range(30):
+                    total = Value(0.0)
+                    for x, y in dataset:
+                        total = total + (mlp([Value(xi) for xi in x]) - y) ** 2
+                    optimizer.zero_grad()
+                    total.backward()
+                    optimizer.step()
+                    losses.append(total.data)
+                self.assertLess(losses[-1], losses[0])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_forward_batch(self):
+        """Test that the batched CSR forward matches per-sample calls in outputs and gradients"""
+        X = np.array([[random.uniform(-1, 1) for _ in range(5)] for _ in range(6)])
+        for flatten in (False, True):
+            mlp = prune(MLP(5, [7, 3]), 0.6)
+            if flatten:
+                mlp.flatten_parameters()
+            out = mlp.forward_batch(X)
+            out.sum().backward()
+            batched = [p.grad for p in mlp.parameters()]
+            mlp.zero_grad()
+            total = Value(0.0)
+            for i, row in enumerate(X.tolist()):
+                outs = mlp([Value(v) for v in row])
+                np.testing.assert_allclose(out.data[i], [o.data for o in outs], atol=1e-12)
+                total = total + sum(outs, Value(0.0))
+            total.backward()
+            np.testing.assert_allclose(batched, [p.grad for p in mlp.parameters()], atol=1e-12)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_serving_and_quantize(self):
+        """Test that a pruned MLP works with the inference server and int8 quantization"""
+        import asyncio
+        from mymicrograd.serving import InferenceServer
+        from mymicrograd.quantize import quantize, compare
+        mlp = prune(MLP(4, [8, 1]), 0.5)
+        X = np.array([[random.uniform(-1, 1) for _ in range(4)] for _ in range(8)])
+
+        async def run():
+            async with InferenceServer(mlp) as server:
+                return await asyncio.gather(*(server.predict(x) for x in X.tolist()))
+
+        for x, got in zip(X.tolist(), asyncio.run(run())):
+            self.assertAlmostEqual(got, mlp([Value(v) for v in x]).data, places=12)
+        report = compare(mlp, quantize(mlp), X)
+        self.assertLess(report['max_abs_diff'], 0.05)
+        self.assertEqual(report['float_bytes'], len(mlp.parameters()) * 8)
+
+    def test_rejects_bad_input(self):
+        """Test CSR validation and the sparsity range"""
+        with self.assertRaises(ValueError):
+            SparseLayer(2, [0, 1], [0, 1], [0.5, 0.5], [0.0])
+        with self.assertRaises(ValueError):
+            prune(MLP(2, [2, 1]), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    from mymicrograd.tensor import Tensor
+except ImportError:
+    np = None
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import Module
+
+def numerical_grad(f, x, h=1e-6):
+    """Central-difference gradient of scalar f with respect to array x"""
+    grad = np.zeros_like(x)
+    for i in np.ndindex(x.shape):
+        orig = x[i]
+        x[i] = orig + h
+        plus = f()
+        x[i] = orig - h
+        minus = f()
+        x[i] = orig
+        grad[i] = (plus - minus) / (2 * h)
+    return grad
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestTensor(unittest.TestCase):
+
+    def test_matches_scalar_value(self):
+        """Test that Tensor gradients match elementwise Value gradients"""
+        xs = [0.5, -1.5, 2.0]
+        t = Tensor(xs)
+        out = ((t * 2.0 + 1.0).tanh() + t.exp() + t ** 2 - t.relu()).sum()
+        out.backward()
+
+        for i, xi in enumerate(xs):
+            v = Value(xi)
+            y = (v * 2.0 + 1.0).tanh() + v.exp() + v ** 2 - v.relu()
+            y.backward()
+            self.assertAlmostEqual(t.grad[i], v.grad, places=10)
+
+    def test_matmul_and_broadcasting(self):
+        """Test matmul and broadcast add/mul against numerical gradients"""
+        rng = np.random.default_rng(0)
+        X = Tensor(rng.normal(size=(4, 3)))
+        W = Tensor(rng.normal(size=(3, 2)))
+        b = Tensor(rng.normal(size=(2,)))
+        s = Tensor(rng.normal(size=(4, 1)))
+
+        def loss():
+            return (((X @ W + b) * s).tanh() ** 2).mean()
+
+        out = loss()
+        out.backward()
+        for param in (X, W, b, s):
+            expected = numerical_grad(lambda: loss().data, param.data)
+            np.testing.assert_allclose(param.grad, expected, atol=1e-6)
+
+    def test_reductions(self):
+        """Test sum and mean over an axis"""
+        A = Tensor(np.arange(6.0).reshape(2, 3))
+        out = (A.sum(axis=0) * Tensor([1.0, 2.0, 3.0])).sum() + A.mean(axis=1, keepdims=True).sum()
+        out.backward()
+
+        expected = np.array([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]]) + 1.0 / 3.0
+        np.testing.assert_allclose(A.grad, expected)
+
+    def test_module_and_optimizer_interop(self):
+        """Test Tensor parameters with Module and the existing optimizers"""
+        from optimizers import SGD, Adam
+
+        class Linear(Module):
+            def __init__(self):
+                self.W = Tensor(np.zeros((2, 1)))
+                self.b = Tensor(np.zeros(1))
+
+            def __call__(self, X):
+                return X @ self.W + self.b
+
+            def parameters(self):
+                return [self.W, self.b]
+
+        X = Tensor([[0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+        y = Tensor([[1.0], [2.0], [3.0]])
+
+        for optimizer_cls in (SGD, Adam):
+            model = Linear()
+            optimizer = optimizer_cls(model.parameters(), lr=0.1)
+            losses = []
+            for _ in range(50):
+                loss = ((model(X) - y) ** 2).mean()
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+                losses.append(float(loss.data))
+            self.assertLess(losses[-1], losses[0] * 0.1)
+            self.assertEqual(model.W.data.shape, (2, 1))
+
+        model.zero_grad()
+        self.assertEqual(model.W.grad, 0)
+
+    def test_backward_releases_graph(self):
+        """Test that Tensor.backward frees the graph unless asked to retain it"""
+        W = Tensor(np.ones((2, 2)))
+        out = (W @ Tensor([1.0, 2.0])).sum()
+        out.backward(retain_graph=True)
+        self.assertEqual(len(out._prev), 1)
+        W.grad = 0.0
+        out.backward()
+        np.testing.assert_allclose(W.grad, [[1.0, 2.0], [1.0, 2.0]])
+        self.assertEqual(out._prev, ())
+        self.assertEqual(out.detach()._prev, ())
+        with self.assertRaises(RuntimeError):
+            out.backward()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
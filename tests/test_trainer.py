@@ -0,0 +1,68 @@
+import unittest
+import copy
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mymicrograd.engine import Value
+from mymicrograd.neuralnet import MLP
+from mymicrograd.trainer import Trainer, accumulate_grad
+from optimizers import SGD
+
+def squared_error(pred, y):
+    return (pred - y) ** 2
+
+class TestTrainer(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(2)
+        self.model = MLP(3, [4, 1])
+        self.dataset = [([random.uniform(-1, 1) for _ in range(3)], random.uniform(-1, 1)) for _ in range(7)]
+
+    def test_accumulate_grad_matches_summed_loss(self):
+        """Test that per-sample backward gives the gradients of the summed loss"""
+        model = self.model
+        total = Value(0.0)
+        for x, y in self.dataset:
+            total = total + squared_error(model([Value(xi) for xi in x]), y)
+        model.zero_grad()
+        total.backward()
+        expected = [p.grad for p in model.parameters()]
+
+        model.zero_grad()
+        loss = accumulate_grad(squared_error(model([Value(xi) for xi in x]), y) for x, y in self.dataset)
+        self.assertAlmostEqual(loss, total.data, places=10)
+        for p, g in zip(model.parameters(), expected):
+            self.assertAlmostEqual(p.grad, g, places=10)
+
+    def test_step_matches_epoch_graph(self):
+        """Test that Trainer steps reproduce training on the summed loss"""
+        reference = copy.deepcopy(self.model)
+        optimizer = SGD(reference.parameters(), lr=0.05)
+        expected_losses = []
+        for _ in range(3):
+            total = Value(0.0)
+            for x, y in self.dataset:
+                total = total + squared_error(reference([Value(xi) for xi in x]), y)
+            optimizer.zero_grad()
+            total.backward()
+            optimizer.step()
+            expected_losses.append(total.data)
+
+        for micro_batch in (1, 3):
+            model = copy.deepcopy(self.model)
+            trainer = Trainer(model, squared_error, SGD(model.parameters(), lr=0.05), micro_batch=micro_batch)
+            losses = [trainer.step(self.dataset) for _ in range(3)]
+            for got, expected in zip(losses, expected_losses):
+                self.assertAlmostEqual(got, expected, places=10)
+            for p, q in zip(model.parameters(), reference.parameters()):
+                self.assertAlmostEqual(p.data, q.data, places=10)
+
+    def test_invalid_micro_batch(self):
+        """Test that a micro-batch size below one is rejected"""
+        with self.assertRaises(ValueError):
+            Trainer(self.model, squared_error, SGD(self.model.parameters()), micro_batch=0)
+
+if __name__ == '__main__':
+    unittest.main()